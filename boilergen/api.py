@@ -0,0 +1,193 @@
+"""
+Project generation for embedding boilergen in other programs.
+
+Nothing here prompts, clears the screen or changes process wide state such as the working directory, so generate
+can be called repeatedly and from several threads of a long running service. Output is not captured: template.yaml
+files that cannot be loaded are reported on stdout and skipped, and hook commands write to this process's streams.
+
+    catalog = TemplateCatalog("boilergen/templates")
+    result = generate(["flask-api"], "out/orders", {"port": 8080}, GenerationOptions(catalog=catalog))
+    print(result.files, result.timings)
+"""
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from boilergen.builder.hooks import process_post_generation_hook, process_pre_generation_hook
+from boilergen.builder.output_selection import force_remove_readonly
+from boilergen.builder.parse_cache import ParseCache
+from boilergen.builder.parser.injections import run_injections
+from boilergen.builder.generation_logic import generate_file_content_data
+from boilergen.builder.project_setup import (apply_config_values, prepare_objects,
+                                             refresh_tags_and_configs_after_injections, sort_templates_by_dependencies)
+from boilergen.builder.writer import LinkMode, WriteStats, copy_files, write_files
+from boilergen.cli.run_config import RunConfig
+from boilergen.core.catalog import TemplateCatalog
+from boilergen.core.template import Template
+from boilergen.core.template_finder import resolve_dependencies
+
+
+class GenerationError(Exception):
+    """Raised when the requested templates cannot be generated."""
+
+
+class GenerationOptions:
+    """
+    Settings of one generate call, mirroring the flags of `boilergen create`.
+
+    Template ids are looked up in catalog, or in a catalog scanned from template_dir for every call when only that
+    is given. Hooks run from the parent of template_dir (or of the catalog's base path) if run_hooks is set.
+    A parse_cache is shared by all calls that get the same instance; it is only written to disk if it has a path.
+    """
+
+    def __init__(self, template_dir: Optional[Union[str, Path]] = None, catalog: Optional[TemplateCatalog] = None,
+                 clear_output: bool = False, disable_dependencies: bool = False,
+                 disable_quote_parsing: bool = False, link_mode: LinkMode = LinkMode.COPY, jobs: Optional[int] = None,
+                 parse_cache: Optional[ParseCache] = None, run_hooks: bool = True):
+        self.template_dir = template_dir
+        self.catalog = catalog
+        self.clear_output = clear_output
+        self.disable_dependencies = disable_dependencies
+        self.disable_quote_parsing = disable_quote_parsing
+        self.link_mode = link_mode
+        self.jobs = jobs
+        self.parse_cache = parse_cache
+        self.run_hooks = run_hooks
+
+    @property
+    def template_root(self) -> Optional[Path]:
+        template_dir = self.template_dir if self.template_dir is not None else (
+            self.catalog.base_path if self.catalog is not None else None)
+        return Path(template_dir).parent if template_dir is not None else None
+
+
+class GenerationResult:
+    """Files written by one generate call and the seconds spent in each phase."""
+
+    def __init__(self, output: Path, files: List[str], stats: WriteStats, timings: Dict[str, float]):
+        self.output = output
+        self.files = files
+        self.stats = stats
+        self.timings = timings
+
+    @property
+    def seconds(self) -> float:
+        return sum(self.timings.values())
+
+    def __repr__(self):
+        return f"GenerationResult(output={self.output}, files={len(self.files)}, seconds={self.seconds:.3f})"
+
+
+def _select_templates(templates: Sequence[Union[str, Template]], options: GenerationOptions) -> List[Template]:
+    if all(isinstance(t, Template) for t in templates):
+        return list(templates)
+
+    catalog = options.catalog
+    if catalog is None:
+        if options.template_dir is None:
+            raise GenerationError("Template ids need a catalog or template_dir in the options")
+        catalog = TemplateCatalog(options.template_dir, jobs=options.jobs)
+    all_templates = dict(catalog.templates)
+    ids = []
+    for t in templates:
+        if isinstance(t, Template):
+            all_templates[t.id] = t
+        ids.append(t.id if isinstance(t, Template) else t)
+
+    unknown = [tid for tid in ids if tid not in all_templates]
+    if unknown:
+        raise GenerationError(f"Unknown template id(s): {', '.join(unknown)}")
+    if options.disable_dependencies:
+        return [all_templates[tid] for tid in ids]
+    required_ids, _ = resolve_dependencies(ids, all_templates)
+    return [all_templates[tid] for tid in required_ids if tid in all_templates]
+
+
+def _prepare_output(output: Path, clear_output: bool):
+    if output.exists():
+        if not clear_output:
+            raise FileExistsError(f"Output directory {output} already exists")
+        shutil.rmtree(output, onerror=force_remove_readonly)
+    output.mkdir(parents=True, exist_ok=True)
+
+
+def generate(templates: Sequence[Union[str, Template]], output: Union[str, Path],
+             config_values: Optional[Dict[str, Any]] = None,
+             options: Optional[GenerationOptions] = None) -> GenerationResult:
+    """
+    Generate a project from templates (ids or Template objects) into output.
+
+    config_values replace what the interactive editor would ask for, configs that are not listed keep their
+    template.yaml or default value. Raises GenerationError for unknown templates, dependency problems and configs
+    without a value, and FileExistsError if output exists and clear_output is not set. If generation fails after
+    output was created, output is removed again.
+    """
+    options = options or GenerationOptions()
+    timings: Dict[str, float] = {}
+    start = time.perf_counter()
+
+    def lap(phase: str):
+        nonlocal start
+        now = time.perf_counter()
+        timings[phase] = timings.get(phase, 0.0) + now - start
+        start = now
+
+    selected = _select_templates(templates, options)
+    try:
+        sort_templates_by_dependencies(selected, not options.disable_dependencies)
+    except ValueError as e:
+        raise GenerationError(str(e)) from e
+    output = Path(os.path.abspath(str(output)))
+    run_config = RunConfig(
+        disable_dependencies=options.disable_dependencies,
+        minimal_ui=True,
+        clear_output=options.clear_output,
+        disable_quote_parsing_for_configs=options.disable_quote_parsing,
+        parse_cache=options.parse_cache,
+        link_mode=options.link_mode,
+        headless=True,
+        config_values=dict(config_values or {}),
+        jobs=options.jobs,
+    )
+    _prepare_output(output, options.clear_output)
+    lap("select")
+
+    template_root = options.template_root if options.run_hooks else None
+    try:
+        if template_root is not None:
+            process_pre_generation_hook(str(output), str(template_root))
+            lap("hooks")
+
+        template_files = prepare_objects(output, selected, run_config)
+        lap("prepare")
+
+        run_injections(template_files, run_config, str(output))
+        refresh_tags_and_configs_after_injections(template_files, run_config)
+        lap("injections")
+
+        for tf in template_files:
+            apply_config_values(tf, run_config.config_values)
+            generate_file_content_data(tf, run_config)
+        lap("render")
+
+        passthrough = list(template_files.passthrough.values())
+        stats = copy_files(passthrough, run_config.link_mode, run_config.jobs)
+        stats = stats.merge(write_files(((tf.destination_path, tf.content) for tf in template_files), run_config.jobs))
+        lap("write")
+    except Exception as e:
+        # The directory was created (or emptied) by this call, do not leave a half generated project behind
+        if output.exists():
+            shutil.rmtree(output, onerror=force_remove_readonly)
+        if isinstance(e, ValueError):
+            raise GenerationError(str(e)) from e
+        raise
+
+    if template_root is not None:
+        process_post_generation_hook(str(output), str(template_root))
+        lap("hooks")
+
+    written = [destination for _, destination in passthrough] + [tf.destination_path for tf in template_files]
+    files = list(dict.fromkeys(os.path.normpath(path) for path in written))
+    return GenerationResult(output, files, stats, timings)
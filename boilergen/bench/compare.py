@@ -0,0 +1,102 @@
+import json
+import platform
+import statistics
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from boilergen.bench.runner import PHASES, BenchmarkResult, boilergen_version
+from boilergen.bench.synthetic import SyntheticSpec
+
+BASELINE_VERSION = 1
+DEFAULT_THRESHOLD = 0.10
+# Phases that take about a millisecond move by more than any sensible threshold just from scheduling noise
+DEFAULT_MIN_DELTA = 0.001
+
+
+class BaselineError(ValueError):
+    """Raised for baseline files that cannot be compared against."""
+
+
+class PhaseStats:
+    """Median and interquartile range of the seconds a phase took over repeated runs."""
+
+    def __init__(self, samples: List[float]):
+        self.samples = list(samples)
+        self.median = statistics.median(self.samples)
+        if len(self.samples) > 1:
+            q1, _, q3 = statistics.quantiles(self.samples, n=4, method="inclusive")
+            self.iqr = q3 - q1
+        else:
+            self.iqr = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"median": self.median, "iqr": self.iqr, "samples": self.samples}
+
+
+class BenchmarkSummary:
+    """Per-phase statistics of repeated runs of one workload, the format baselines are stored in."""
+
+    def __init__(self, spec: SyntheticSpec, phases: Dict[str, PhaseStats], metadata: Optional[Dict[str, Any]] = None):
+        self.spec = spec
+        self.phases = phases
+        self.metadata = metadata or {"boilergen": boilergen_version(), "python": platform.python_version(),
+                                     "platform": platform.platform()}
+
+    @classmethod
+    def from_results(cls, spec: SyntheticSpec, results: List[BenchmarkResult]) -> 'BenchmarkSummary':
+        phases = {phase: PhaseStats([r.timings[phase] for r in results]) for phase in PHASES}
+        phases["total"] = PhaseStats([r.total for r in results])
+        return cls(spec, phases)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": BASELINE_VERSION,
+            **self.metadata,
+            "workload": self.spec.to_dict(),
+            "phases": {phase: stats.to_dict() for phase, stats in self.phases.items()},
+        }
+
+    def save(self, path: Union[str, Path]):
+        Path(path).write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'BenchmarkSummary':
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            raise BaselineError(f"Cannot read baseline {path}: {e}") from e
+        if not isinstance(data, dict) or data.get("version") != BASELINE_VERSION:
+            raise BaselineError(f"{path} is not a benchmark baseline of version {BASELINE_VERSION}")
+        try:
+            spec = SyntheticSpec.from_dict(data["workload"])
+            phases = {phase: PhaseStats(stats["samples"]) for phase, stats in data["phases"].items()}
+        except (KeyError, TypeError, statistics.StatisticsError) as e:
+            raise BaselineError(f"Malformed baseline {path}: {e}") from e
+        metadata = {key: data.get(key) for key in ("boilergen", "python", "platform")}
+        return cls(spec, phases, metadata)
+
+
+class PhaseComparison:
+    """
+    Difference of one phase between a baseline and the current run.
+
+    A phase regresses when its median grew by more than threshold (relative) and the growth is larger than the
+    noise, the bigger of both interquartile ranges and min_delta seconds.
+    """
+
+    def __init__(self, phase: str, baseline: PhaseStats, current: PhaseStats, threshold: float = DEFAULT_THRESHOLD,
+                 min_delta: float = DEFAULT_MIN_DELTA):
+        self.phase = phase
+        self.baseline = baseline
+        self.current = current
+        self.delta = current.median - baseline.median
+        self.ratio = self.delta / baseline.median if baseline.median > 0 else 0.0
+        noise = max(baseline.iqr, current.iqr, min_delta)
+        self.regressed = self.ratio > threshold and self.delta > noise
+
+
+def compare(baseline: BenchmarkSummary, current: BenchmarkSummary, threshold: float = DEFAULT_THRESHOLD,
+            min_delta: float = DEFAULT_MIN_DELTA) -> List[PhaseComparison]:
+    """Compare every phase both summaries have, in pipeline order."""
+    return [PhaseComparison(phase, baseline.phases[phase], current.phases[phase], threshold, min_delta)
+            for phase in current.phases if phase in baseline.phases]
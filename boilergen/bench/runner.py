@@ -0,0 +1,147 @@
+import importlib.metadata
+import json
+import platform
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from boilergen.builder.generation_logic import generate_file_content_data
+from boilergen.builder.parser.injections import run_injections
+from boilergen.builder.project_setup import prepare_objects, refresh_tags_and_configs_after_injections
+from boilergen.builder.source_cache import SourceCache
+from boilergen.builder.writer import copy_files, write_files
+from boilergen.cli.run_config import RunConfig
+from boilergen.core.template_finder import find_all_templates, resolve_dependencies
+from boilergen.bench.synthetic import SyntheticSpec, generate_template_tree
+
+# In pipeline order
+PHASES = [
+    "find_all_templates",
+    "resolve_dependencies",
+    "prepare_objects",
+    "run_injections",
+    "refresh_tags_and_configs_after_injections",
+    "generate_file_content_data",
+    "write",
+]
+
+
+class BenchmarkResult:
+    """Seconds per pipeline phase of one run, plus what the run produced."""
+
+    def __init__(self, timings: Dict[str, float], templates: int = 0, files: int = 0, bytes_written: int = 0,
+                 spec: Optional[SyntheticSpec] = None):
+        self.timings = timings
+        self.templates = templates
+        self.files = files
+        self.bytes_written = bytes_written
+        self.spec = spec
+
+    @property
+    def total(self) -> float:
+        return sum(self.timings.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "boilergen": boilergen_version(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "workload": self.spec.to_dict() if self.spec is not None else None,
+            "templates": self.templates,
+            "files": self.files,
+            "bytes_written": self.bytes_written,
+            "phases": {phase: self.timings[phase] for phase in PHASES if phase in self.timings},
+            "total": self.total,
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+
+def boilergen_version() -> str:
+    try:
+        return importlib.metadata.version("boilergen")
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def run_pipeline(templates_dir: Union[str, Path], output_dir: Union[str, Path],
+                 jobs: Optional[int] = None) -> BenchmarkResult:
+    """
+    Generate every template below templates_dir into output_dir and time each phase separately.
+
+    Only the templates no other template requires are selected, so dependency resolution has to add the rest.
+    No parse cache and a fresh injection source cache are used, every run parses and reads everything.
+    """
+    timings: Dict[str, float] = {}
+
+    def lap(phase: str):
+        nonlocal start
+        now = time.perf_counter()
+        timings[phase] = now - start
+        start = now
+
+    output_dir = Path(output_dir)
+    if output_dir.exists():
+        shutil.rmtree(output_dir)
+    output_dir.mkdir(parents=True)
+    run_config = RunConfig(minimal_ui=True, headless=True, jobs=jobs)
+    start = time.perf_counter()
+
+    all_templates = find_all_templates(str(templates_dir))
+    lap("find_all_templates")
+
+    required_by_others = {dep for t in all_templates.values() for dep in t.requires}
+    leaves = sorted(tid for tid in all_templates if tid not in required_by_others)
+    required_ids, _ = resolve_dependencies(leaves, all_templates)
+    selected = [all_templates[tid] for tid in required_ids if tid in all_templates]
+    lap("resolve_dependencies")
+
+    template_files = prepare_objects(output_dir, selected, run_config)
+    lap("prepare_objects")
+
+    run_injections(template_files, run_config, str(output_dir), SourceCache())
+    lap("run_injections")
+
+    refresh_tags_and_configs_after_injections(template_files, run_config)
+    lap("refresh_tags_and_configs_after_injections")
+
+    for tf in template_files:
+        generate_file_content_data(tf, run_config)
+    lap("generate_file_content_data")
+
+    stats = copy_files(template_files.passthrough.values(), run_config.link_mode, jobs)
+    stats = stats.merge(write_files(((tf.destination_path, tf.content) for tf in template_files), jobs))
+    lap("write")
+
+    return BenchmarkResult(timings, len(selected), stats.files, stats.bytes_written)
+
+
+def run_synthetic(spec: SyntheticSpec, jobs: Optional[int] = None,
+                  workdir: Optional[Union[str, Path]] = None) -> BenchmarkResult:
+    """Generate a template repository for spec in workdir (a temporary directory by default) and time it."""
+    with tempfile.TemporaryDirectory(prefix="boilergen-bench-", dir=workdir) as root:
+        templates_dir = generate_template_tree(root, spec)
+        result = run_pipeline(templates_dir, Path(root) / "output", jobs)
+    result.spec = spec
+    return result
+
+
+def run_repeated(spec: SyntheticSpec, repeat: int = 5, warmup: int = 1, jobs: Optional[int] = None,
+                 workdir: Optional[Union[str, Path]] = None) -> List[BenchmarkResult]:
+    """
+    Run the pipeline repeat times on one repository generated for spec, after warmup untimed runs.
+
+    The warmup runs fill the OS file cache and import everything lazily imported, so the timed runs measure
+    boilergen rather than the first touch of the disk.
+    """
+    with tempfile.TemporaryDirectory(prefix="boilergen-bench-", dir=workdir) as root:
+        templates_dir = generate_template_tree(root, spec)
+        for _ in range(warmup):
+            run_pipeline(templates_dir, Path(root) / "output", jobs)
+        results = [run_pipeline(templates_dir, Path(root) / "output", jobs) for _ in range(repeat)]
+    for result in results:
+        result.spec = spec
+    return results
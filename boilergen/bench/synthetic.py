@@ -0,0 +1,105 @@
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Union
+
+import yaml
+
+
+class SyntheticSpec:
+    """
+    Shape of a generated template repository.
+
+    Templates form dependency chains of `depth` templates, every template except the first of a chain requires
+    its predecessor and injects into the predecessor's files. Every file holds `tags` tagged blocks of
+    `lines_per_tag` lines and `configs` config markers spread over those blocks.
+    """
+
+    def __init__(self, templates: int = 20, depth: int = 3, files: int = 10, tags: int = 3, configs: int = 3,
+                 injections: int = 2, lines_per_tag: int = 5):
+        self.templates = templates
+        self.depth = max(1, depth)
+        self.files = files
+        self.tags = tags
+        self.configs = configs
+        self.injections = injections if files and tags else 0
+        self.lines_per_tag = lines_per_tag
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(vars(self))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SyntheticSpec':
+        return cls(**data)
+
+    def __eq__(self, other):
+        return isinstance(other, SyntheticSpec) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"SyntheticSpec({', '.join(f'{k}={v}' for k, v in self.to_dict().items())})"
+
+
+def template_id(index: int) -> str:
+    return f"t{index:03d}"
+
+
+def _requires(index: int, spec: SyntheticSpec) -> List[str]:
+    return [template_id(index - 1)] if index % spec.depth else []
+
+
+def _file_content(tid: str, file_index: int, spec: SyntheticSpec) -> str:
+    lines = [f"# {tid} module {file_index}", "import os", ""]
+    configs_by_tag: Dict[int, List[int]] = {}
+    for c in range(spec.configs):
+        configs_by_tag.setdefault(c % spec.tags if spec.tags else -1, []).append(c)
+
+    # Configs that have no tag to live in go to the top of the file
+    for c in configs_by_tag.get(-1, []):
+        lines.append(f'value_{c} = boilergen:config | {tid}_c{c} | "default_{c}"')
+    for tag in range(spec.tags):
+        lines.append(f"# <<boilergen:block_{tag}")
+        for c in configs_by_tag.get(tag, []):
+            lines.append(f'value_{c} = boilergen:config | {tid}_c{c} | "default_{c}"')
+        lines.extend(f"line_{tag}_{n} = os.getcwd()" for n in range(spec.lines_per_tag))
+        lines.append(f"# boilergen:block_{tag}>>")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def generate_template_tree(root: Union[str, Path], spec: SyntheticSpec) -> Path:
+    """Write a template repository shaped by spec below root and return its templates directory."""
+    templates_dir = Path(root) / "templates"
+    for index in range(spec.templates):
+        tid = template_id(index)
+        requires = _requires(index, spec)
+        template_path = templates_dir / f"group{index // 10}" / tid
+        files_dir = template_path / "template" / tid
+        os.makedirs(files_dir, exist_ok=True)
+
+        manifest = {"id": tid, "label": f"Template {index}", "requires": requires}
+        if spec.configs:
+            manifest["config"] = {f"{tid}_c0": f"yaml_{index}"}
+        with open(template_path / "template.yaml", "w", encoding="utf-8") as f:
+            yaml.safe_dump(manifest, f, sort_keys=False)
+
+        for file_index in range(spec.files):
+            with open(files_dir / f"module_{file_index}.py", "w", encoding="utf-8") as f:
+                f.write(_file_content(tid, file_index, spec))
+
+        if requires and spec.injections:
+            target = requires[0]
+            injections_dir = template_path / "injections;"
+            os.makedirs(injections_dir, exist_ok=True)
+            definitions = []
+            for k in range(spec.injections):
+                source = f"inject_{k}.py"
+                with open(injections_dir / source, "w", encoding="utf-8") as f:
+                    f.write(f"injected_{tid}_{k} = True\n")
+                definitions.append({
+                    "target": target,
+                    "at": {"file": f"{target}/module_{k % spec.files}.py", "tag": f"block_{k % spec.tags}"},
+                    "method": {"insert": ["bottom"]},
+                    "from": source,
+                })
+            with open(injections_dir / "injections.yaml", "w", encoding="utf-8") as f:
+                yaml.safe_dump({"injections": definitions}, f, sort_keys=False)
+    return templates_dir
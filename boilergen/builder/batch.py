@@ -0,0 +1,159 @@
+import contextlib
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from boilergen.builder.output_selection import generate_project, prepare_output_directory
+from boilergen.builder.parse_cache import ParseCache, parse_content
+from boilergen.builder.project_setup import collect_template_files, read_files, read_template_file
+from boilergen.cli.manifest import Manifest, ManifestError
+from boilergen.cli.run_config import RunConfig
+from boilergen.core.template import Template
+from boilergen.core.ui import get_ui
+
+
+class ProjectResult:
+    """Outcome of generating one manifest of a batch."""
+
+    def __init__(self, manifest: str, output: Optional[str] = None, files: int = 0, bytes_written: int = 0,
+                 seconds: float = 0.0, error: Optional[str] = None, log: str = ""):
+        self.manifest = manifest
+        self.output = output
+        self.files = files
+        self.bytes_written = bytes_written
+        self.seconds = seconds
+        self.error = error
+        self.log = log  # everything the generation printed, kept so parallel projects do not interleave
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def warm_parse_cache(templates: List[Template], cache: ParseCache, jobs: Optional[int] = None) -> int:
+    """
+    Parse every template file with markers into cache once, before the batch starts.
+
+    Workers then only look parse results up instead of every project reparsing the files of shared templates.
+    Returns the number of files that needed parsing.
+    """
+    files = [source for template in templates for source, _ in collect_template_files(Path(template.path), Path())]
+    misses = cache.misses
+    for content in read_files(files, read_template_file, jobs):
+        if content is not None:
+            parse_content(content, cache)
+    return cache.misses - misses
+
+
+# Set once per worker process by _init_worker, shared by every project the worker generates
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(templates: Dict[str, Template], template_dir: str, cache_path: Optional[Path],
+                 options: Dict[str, Any]):
+    parse_cache = None
+    if cache_path is not None:
+        parse_cache = ParseCache.load(cache_path)
+        # Only the parent writes the cache, workers would overwrite each other's copy after every project
+        parse_cache.path = None
+    _worker.update(templates=templates, template_dir=template_dir, parse_cache=parse_cache, options=options)
+
+
+def _generate(manifest_path: str, manifest: Manifest) -> ProjectResult:
+    start = time.perf_counter()
+    result = ProjectResult(manifest_path, str(manifest.output))
+    log = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+            options = dict(_worker["options"])
+            run_config = RunConfig(
+                minimal_ui=True,
+                headless=True,
+                config_values=manifest.config,
+                parse_cache=_worker["parse_cache"],
+                **options
+            )
+            run_config.clear_output = run_config.clear_output or manifest.clear_output
+            selected = manifest.select_templates(_worker["templates"])
+            if not prepare_output_directory(manifest.output, run_config, get_ui(True), confirm=False):
+                result.error = f"Output directory {manifest.output} already exists or could not be cleared"
+            else:
+                stats = generate_project(manifest.output, selected, run_config, _worker["template_dir"])
+                if stats is not None:
+                    result.files = stats.files
+                    result.bytes_written = stats.bytes_written
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    result.seconds = time.perf_counter() - start
+    result.log = log.getvalue()
+    return result
+
+
+def run_batch(manifest_paths: List[Union[str, Path]], templates: Dict[str, Template], template_dir: Union[str, Path],
+              parse_cache: Optional[ParseCache] = None, processes: Optional[int] = None,
+              options: Optional[Dict[str, Any]] = None,
+              on_result: Optional[Callable[[ProjectResult], None]] = None) -> List[ProjectResult]:
+    """
+    Generate one project per manifest and return the results in manifest order.
+
+    Manifests are validated and the parse cache is warmed for all of their templates up front, then the projects
+    are generated on a process pool whose workers receive the catalog and the warmed cache once. options are
+    passed on to every project's RunConfig. processes=1 generates in this process. on_result is called as
+    projects finish.
+    """
+    results: List[Optional[ProjectResult]] = [None] * len(manifest_paths)
+    pending = []
+    selected: Dict[str, Template] = {}
+    for i, path in enumerate(manifest_paths):
+        path = os.path.abspath(str(path))
+        try:
+            manifest = Manifest.from_file(path)
+            for template in manifest.select_templates(templates):
+                selected[template.id] = template
+        except ManifestError as e:
+            results[i] = ProjectResult(path, error=str(e))
+            if on_result is not None:
+                on_result(results[i])
+            continue
+        pending.append((i, path, manifest))
+
+    cache_path = None
+    if parse_cache is not None:
+        warm_parse_cache(list(selected.values()), parse_cache)
+        parse_cache.save()
+        cache_path = parse_cache.path
+
+    init_args = (templates, os.path.abspath(str(template_dir)), cache_path, options or {})
+
+    def finish(i: int, result: ProjectResult):
+        results[i] = result
+        if on_result is not None:
+            on_result(result)
+
+    if processes == 1 or len(pending) < 2:
+        _init_worker(templates, init_args[1], None, init_args[3])
+        _worker["parse_cache"] = parse_cache
+        if parse_cache is not None:
+            parse_cache.path = None
+        try:
+            for i, path, manifest in pending:
+                finish(i, _generate(path, manifest))
+        finally:
+            if parse_cache is not None:
+                parse_cache.path = cache_path
+            _worker.clear()
+    else:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=init_args) as pool:
+            futures = {pool.submit(_generate, path, manifest): (i, path, manifest) for i, path, manifest in pending}
+            for future in as_completed(futures):
+                i, path, manifest = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # The worker itself died, e.g. it was killed or the pool broke
+                    result = ProjectResult(path, str(manifest.output), error=f"{type(e).__name__}: {e}")
+                finish(i, result)
+    return results
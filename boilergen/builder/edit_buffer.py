@@ -0,0 +1,72 @@
+import itertools
+from typing import List, Set, Tuple
+
+
+class EditBuffer:
+    """
+    Collects replacements and line deletions on a text and renders all of them in one pass.
+
+    Offsets always refer to the original text, so edits can be recorded in any order.
+    Overlapping edits are resolved in favour of the one that starts first, except that a cleared line
+    always removes whatever is left of that line.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self._replacements: List[Tuple[int, int, str]] = []
+        self._cleared_lines: Set[int] = set()
+        self._clears_unterminated_last_line = False
+
+    def replace(self, start: int, end: int, value: str):
+        """Replace text[start:end] with value."""
+        self._replacements.append((start, end, value))
+
+    def clear_line(self, line_number: int):
+        """Empty the 1-based line while keeping its line ending."""
+        self._cleared_lines.add(line_number)
+
+    def _line_clear_edits(self) -> List[Tuple[int, int, str]]:
+        lines = self.text.splitlines(keepends=True)
+        offsets = [0, *itertools.accumulate(len(line) for line in lines)]
+        edits = []
+        self._clears_unterminated_last_line = False
+        for line_number in self._cleared_lines:
+            if not 1 <= line_number <= len(lines):
+                continue
+            line = lines[line_number - 1]
+            start = offsets[line_number - 1]
+            content_length = len(line.splitlines()[0])
+            edits.append((start, start + content_length, ""))
+            if line_number == len(lines) and content_length == len(line):
+                self._clears_unterminated_last_line = True
+        return edits
+
+    def render(self) -> str:
+        """Apply all recorded edits and return the resulting text."""
+        # Line clears sort in front of replacements starting at the same offset
+        edits = [(start, 0, end, value) for start, end, value in self._line_clear_edits()]
+        edits.extend((start, 1, end, value) for start, end, value in self._replacements)
+        if not edits:
+            return self.text
+        edits.sort(key=lambda e: (e[0], e[1]))
+
+        pieces = []
+        cursor = 0
+        for start, is_replacement, end, value in edits:
+            if start < cursor:
+                if is_replacement or end <= cursor:
+                    continue
+                start = cursor
+            pieces.append(self.text[cursor:start])
+            pieces.append(value)
+            cursor = max(cursor, end)
+        pieces.append(self.text[cursor:])
+        return "".join(pieces)
+
+    def render_lines(self) -> List[str]:
+        """Render and split into lines without line endings, cleared lines are kept as empty lines."""
+        lines = self.render().splitlines()
+        if self._clears_unterminated_last_line:
+            # An emptied last line without line ending would otherwise vanish
+            lines.append("")
+        return lines
@@ -0,0 +1,60 @@
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from boilergen.builder.parser.tags import TemplateFile
+
+
+def normalize_destination(path: str) -> str:
+    return os.path.normpath(path)
+
+
+class TemplateFileRegistry(list):
+    """List of template files that is additionally indexed by normalized destination path."""
+
+    def __init__(self, template_files: Iterable[TemplateFile] = ()):
+        super().__init__()
+        # normalized destination -> files claiming it, in registration order
+        self._by_destination: Dict[str, List[TemplateFile]] = {}
+        # InjectionRegistry of the generation run, set by prepare_objects
+        self.injections = None
+        # normalized destination -> (source, destination) of files that are copied without rendering
+        self.passthrough: Dict[str, Tuple[str, str]] = {}
+        self.extend(template_files)
+
+    def append(self, template_file: TemplateFile):
+        super().append(template_file)
+        self._by_destination.setdefault(normalize_destination(template_file.destination_path), []).append(template_file)
+
+    def extend(self, template_files: Iterable[TemplateFile]):
+        for template_file in template_files:
+            self.append(template_file)
+
+    def remove(self, template_file: TemplateFile):
+        super().remove(template_file)
+        destination = normalize_destination(template_file.destination_path)
+        entries = self._by_destination[destination]
+        entries.remove(template_file)
+        if not entries:
+            del self._by_destination[destination]
+
+    def remove_destination(self, destination_path: str) -> List[TemplateFile]:
+        """Remove and return every template file written to destination_path."""
+        entries = self._by_destination.pop(normalize_destination(destination_path), [])
+        for template_file in entries:
+            super().remove(template_file)
+        return entries
+
+    def get(self, destination_path: str) -> Optional[TemplateFile]:
+        """Return the template file written to destination_path, the first file claiming it wins."""
+        entries = self._by_destination.get(normalize_destination(destination_path))
+        return entries[0] if entries else None
+
+    def resolve(self, output_path: str, relative_path: str) -> Optional[TemplateFile]:
+        """Return the template file written to relative_path inside output_path."""
+        return self.get(os.path.join(output_path, relative_path))
+
+
+def as_registry(template_files: List[TemplateFile]) -> TemplateFileRegistry:
+    if isinstance(template_files, TemplateFileRegistry):
+        return template_files
+    return TemplateFileRegistry(template_files)
@@ -1,12 +1,15 @@
-import re
 import boilergen.cli.run_config
-from boilergen.builder.parser.tags import TemplateFile, TAG_OPENING_REGEX, TAG_CLOSING_REGEX
+from boilergen.builder.edit_buffer import EditBuffer
+from boilergen.builder.parser.configs import NOT_DEFINED
+from boilergen.builder.parser.tags import TemplateFile
+from boilergen.builder.parser.tokenizer import TokenType, tokenize
 
 
 def generate_file_content_data(file: TemplateFile, run_config: boilergen.cli.run_config.RunConfig):
     text = file.content
+    buffer = EditBuffer(text)
     # Configs
-    for config in sorted(file.configs, key=lambda c: c.replacement_start, reverse=True):
+    for config in file.configs:
         start = config.replacement_start
         end = config.replacement_end
         if start > 0 and end < len(text):
@@ -14,15 +17,15 @@ def generate_file_content_data(file: TemplateFile, run_config: boilergen.cli.run
                 if text[start - 1] in ['"', "'"] and text[end] in ['"', "'"]:
                     start -= 1
                     end += 1
-        text = text[:start] + config.insertion_value + text[end:]
-
-    # Tag removal - robust against line shifts from configs
-    # We replace the entire line containing a tag with an empty string to maintain original behavior
-    lines = text.splitlines()
-    for i, line in enumerate(lines):
-        if re.search(TAG_OPENING_REGEX, line) or re.search(TAG_CLOSING_REGEX, line):
-            lines[i] = ""
-    
-    file.content = "\n".join(lines)
+        value = config.insertion_value
+        if value is NOT_DEFINED:
+            raise ValueError(f"Missing config value for '{config.identifier}' in {file.destination_path}")
+        buffer.replace(start, end, value if isinstance(value, str) else str(value))
 
+    # Tag removal - we replace the entire line containing a tag with an empty string to maintain original behavior
+    tokens = file.tokens if file.index_is_current else tokenize(text)
+    for token in tokens:
+        if token.token_type != TokenType.CONFIG:
+            buffer.clear_line(token.line)
 
+    file.content = "\n".join(buffer.render_lines())
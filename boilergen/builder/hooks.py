@@ -1,21 +1,20 @@
 import os
+import subprocess
 
 
-def process_post_generation_hook(output_path: str, hook_position: str):
-    hook_position = os.path.join(hook_position, "hooks")
-    os.chdir(output_path)
-    if not os.path.exists(os.path.join(hook_position, "post-generation.txt")):
+def _run_hook(output_path: str, hook_file: str):
+    # Every command runs in the output directory, without changing the working directory of this process
+    if not os.path.exists(hook_file):
         return
-    with open(os.path.join(hook_position, "post-generation.txt"), "r") as f:
+    with open(hook_file, "r") as f:
         for line in f.readlines():
-            os.system(line)
+            if line.strip():
+                subprocess.run(line, shell=True, cwd=output_path)
+
+
+def process_post_generation_hook(output_path: str, hook_position: str):
+    _run_hook(output_path, os.path.join(hook_position, "hooks", "post-generation.txt"))
 
 
 def process_pre_generation_hook(output_path: str, hook_position: str):
-    hook_position = os.path.join(hook_position, "hooks")
-    os.chdir(output_path)
-    if not os.path.exists(os.path.join(hook_position, "pre-generation.txt")):
-        return
-    with open(os.path.join(hook_position, "pre-generation.txt"), "r") as f:
-        for line in f.readlines():
-            os.system(line)
+    _run_hook(output_path, os.path.join(hook_position, "hooks", "pre-generation.txt"))
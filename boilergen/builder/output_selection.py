@@ -1,9 +1,10 @@
 import shutil
 import stat
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 from boilergen.builder.hooks import process_post_generation_hook, process_pre_generation_hook
 from boilergen.builder.project_setup import create_project
+from boilergen.builder.writer import WriteStats
 from boilergen.core.template import Template
 from boilergen.core.ui import get_ui
 
@@ -26,30 +27,48 @@ def ask_for_output_location(selected_templates: List[Template], run_config, temp
     default_output = str(Path.cwd() / "output")
     output_path = Path(ui.prompt("Where do you want to generate the output?", default=default_output))
 
-    if not run_config.dry_run:
-        if not output_path.exists():
-            output_path.mkdir(parents=True, exist_ok=True)
-        elif run_config.clear_output:
-            if ui.confirm(f"Output directory {output_path} already exists. Overwrite it? (DELETES DATA!)"):
-                try:
-                    shutil.rmtree(output_path, onerror=force_remove_readonly)
-                    output_path.mkdir(parents=True, exist_ok=True)
-                except PermissionError:
-                    ui.error("Permission denied while deleting output directory.")
-                    return
-        else:
-            ui.error(f"Output directory {output_path} already exists. Use --clear-output to overwrite.")
-            return
+    if not prepare_output_directory(output_path, run_config, ui):
+        return
+
+    generate_project(output_path, selected_templates, run_config, template_dir)
+    clear_cloned_repo(str(Path(template_dir).parent), run_config.minimal_ui, ui)
+
+
+def prepare_output_directory(output_path: Path, run_config, ui, confirm: bool = True) -> bool:
+    """
+    Create the output directory or clear it if --clear-output allows that.
 
+    Returns False if generation must not continue. With confirm=False an existing directory is cleared without
+    asking, which is what unattended runs rely on.
+    """
+    if run_config.dry_run:
+        return True
+    if not output_path.exists():
+        output_path.mkdir(parents=True, exist_ok=True)
+    elif run_config.clear_output:
+        if not confirm or ui.confirm(f"Output directory {output_path} already exists. Overwrite it? (DELETES DATA!)"):
+            try:
+                shutil.rmtree(output_path, onerror=force_remove_readonly)
+                output_path.mkdir(parents=True, exist_ok=True)
+            except PermissionError:
+                ui.error("Permission denied while deleting output directory.")
+                return False
+    else:
+        ui.error(f"Output directory {output_path} already exists. Use --clear-output to overwrite.")
+        return False
+    return True
+
+
+def generate_project(output_path: Path, selected_templates: List[Template], run_config, template_dir: str) -> Optional[WriteStats]:
+    """Run the pre-generation hook, generate the project and run the post-generation hook."""
     # template_dir passed here is the 'templates' subdir. Hooks might need the root.
     template_root = Path(template_dir).parent
     
     if not run_config.dry_run:
         process_pre_generation_hook(str(output_path), str(template_root))
     
-    create_project(str(output_path), selected_templates, run_config)
+    stats = create_project(str(output_path), selected_templates, run_config)
     
     if not run_config.dry_run:
         process_post_generation_hook(str(output_path), str(template_root))
-    
-    clear_cloned_repo(str(template_root), run_config.minimal_ui, ui)
+    return stats
@@ -0,0 +1,163 @@
+import collections
+import hashlib
+import marshal
+import os
+import threading
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+from boilergen.builder.parser.tags import Tag, TagDiagnostic, pair_tags
+from boilergen.builder.parser.tokenizer import MARKER_PREFIX, MarkerToken, TokenType, tokenize
+
+# Bump whenever the tokenizer or tag pairing changes what they produce
+PARSER_VERSION = 1
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+ParseResult = Tuple[List[MarkerToken], List[Tag], List[TagDiagnostic]]
+
+
+class ParseCache:
+    """
+    Parse results of template files keyed by a hash of their content.
+
+    Entries hold the marker tokens, the paired tags and the tag diagnostics as marshal blobs. The whole cache is
+    a single file in the user cache dir that is kept below max_bytes by evicting the least recently used entries
+    when it is saved.
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        # content hash -> marshalled entry, least recently used first
+        self._entries: "collections.OrderedDict[bytes, bytes]" = collections.OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def path_for(cache_dir: Union[str, Path]) -> Path:
+        return Path(cache_dir) / "parse-cache.bin"
+
+    @classmethod
+    def load(cls, path: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> 'ParseCache':
+        """Load the cache at path, starting empty if it is missing, corrupt or written by another parser version."""
+        cache = cls(path, max_bytes)
+        try:
+            with open(path, "rb") as f:
+                version, entries = marshal.load(f)
+            if version == PARSER_VERSION:
+                for key, blob in entries:
+                    cache._entries[key] = blob
+                    cache._size += len(blob)
+                # A smaller max_bytes than the file was written with, the next save has to evict
+                cache.dirty = cache._size > max_bytes
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+        return cache
+
+    @staticmethod
+    def key(content: str) -> bytes:
+        return hashlib.blake2b(content.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def get(self, content: str) -> Optional[ParseResult]:
+        """Return fresh token, tag and diagnostic objects for content if it was parsed before."""
+        key = self.key(content)
+        with self._lock:
+            blob = self._entries.get(key)
+            if blob is None:
+                self.misses += 1
+                return None
+            # Recency only changes the order of entries in memory, it is persisted when the cache is written anyway
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return _decode(blob)
+
+    def put(self, content: str, result: ParseResult):
+        blob = _encode(result)
+        key = self.key(content)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = blob
+            self._size += len(blob)
+            self.dirty = True
+
+    def _evict(self):
+        while self._entries and self._size > self.max_bytes:
+            _, blob = self._entries.popitem(last=False)
+            self._size -= len(blob)
+            self.dirty = True
+
+    def save(self):
+        """
+        Evict down to max_bytes and write the cache atomically if entries were added or evicted.
+
+        Runs that only hit the cache leave the file alone, so the access order of those hits is not persisted.
+        """
+        with self._lock:
+            if not self.dirty or self.path is None:
+                return
+            self._evict()
+            data = (PARSER_VERSION, list(self._entries.items()))
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+                with open(tmp_path, "wb") as f:
+                    marshal.dump(data, f)
+                os.replace(tmp_path, self.path)
+                self.dirty = False
+            except OSError:
+                # The cache is only an accelerator, a read-only cache dir must not break generation
+                pass
+
+
+def _encode(result: ParseResult) -> bytes:
+    tokens, tags, diagnostics = result
+    if not tokens:
+        # Files without markers are the common case, store just the flag
+        return marshal.dumps(True)
+    return marshal.dumps((
+        False,
+        [(t.token_type.value, t.identifier, t.line, t.start, t.end, t.value, t.quote) for t in tokens],
+        [(t.tag_identifier, t.origin_start, t.origin_end) for t in tags],
+        [(d.kind, d.tag_identifier, d.line) for d in diagnostics],
+    ))
+
+
+def _decode(blob: bytes) -> ParseResult:
+    data = marshal.loads(blob)
+    if data is True:
+        return [], [], []
+    _, tokens, tags, diagnostics = data
+    return (
+        [MarkerToken(TokenType(t[0]), *t[1:]) for t in tokens],
+        [Tag(*t) for t in tags],
+        [TagDiagnostic(*d) for d in diagnostics],
+    )
+
+
+def parse_content(content: str, cache: Optional[ParseCache] = None) -> ParseResult:
+    """Tokenize content and pair its tags, going through the cache when one is given."""
+    if MARKER_PREFIX not in content:
+        # Cheaper than hashing the content
+        return [], [], []
+    if cache is not None:
+        cached = cache.get(content)
+        if cached is not None:
+            return cached
+
+    tokens = tokenize(content)
+    tags, diagnostics = pair_tags(tokens)
+    if cache is not None:
+        cache.put(content, (tokens, tags, diagnostics))
+    return tokens, tags, diagnostics
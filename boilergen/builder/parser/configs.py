@@ -1,6 +1,6 @@
-# todo The regex and quote detection was written entirely by AI, seems to work but unit tests are top priority
-import re
-from typing import Union
+from typing import Union, List, Optional
+
+from boilergen.builder.parser.tokenizer import MarkerToken, TokenType, tokenize
 
 
 class NotDefinedType:
@@ -41,87 +41,27 @@ class ValueConfig:
         return f"ValueConfig(identifier={self.identifier}, in_template_value={self.in_template_value}, yaml_value={self.yaml_value}, cli_value={self.cli_value})"
 
 
-def extract_configs(file_content: str):
-    full_pattern = re.compile(
-        r'boilergen:config\s*\|\s*'
-        r'([^\s|]+)'  # identifier
-        r'(?:\s*\|\s*'
-        r'([^"\']*(?:"[^"]*"|\'[^\']*\'[^"\']*)*)'  # optional value (may contain quoted parts)
-        r')?'
-    )
+def extract_configs(file_content: str, tokens: Optional[List[MarkerToken]] = None):
+    if tokens is None:
+        tokens = tokenize(file_content)
 
-    offset = 0
     configs = []
-
-    for line_number, line in enumerate(file_content.splitlines(keepends=True), start=1):
-        in_quotes = []
-        i = 0
-        while i < len(line):
-            if line[i] in ('"', "'"):
-                quote_char = line[i]
-                start_quote = i
-                i += 1
-                while i < len(line) and line[i] != quote_char:
-                    if line[i] == '\\':
-                        i += 2
-                    else:
-                        i += 1
-                if i < len(line):
-                    in_quotes.append((start_quote, i, quote_char, line[start_quote:i + 1]))
-                i += 1
-            else:
-                i += 1
-
-        # 1. Matches **within quotes** (current logic)
-        for start_quote, end_quote, quote_char, quoted_content in in_quotes:
-            inner_content = quoted_content[1:-1]
-            for m in full_pattern.finditer(inner_content):
-                match_start = offset + start_quote + 1 + m.start()
-                match_end = offset + start_quote + 1 + m.end()
-                identifier = m.group(1).strip()
-                raw_value = m.group(2).strip() if m.group(2) is not None else None
-                interpreted_value = interpret_value(raw_value, quote_char)
-
-                config = ValueConfig(
-                    identifier=identifier,
-                    replacement_start=match_start,
-                    replacement_end=match_end,
-                    in_template_value=interpreted_value,
-                    yaml_value=NOT_DEFINED,
-                    cli_value=NOT_DEFINED
-                )
-                configs.append(config)
-
-        # 2. Matches **outside of quotes**
-        quote_ranges = [(s, e) for s, e, *_ in in_quotes]
-
-        def is_outside_quotes(pos):
-            return not any(start <= pos < end + 1 for start, end in quote_ranges)
-
-        for m in full_pattern.finditer(line):
-            if is_outside_quotes(m.start()):
-                match_start = offset + m.start()
-                match_end = offset + m.end()
-                identifier = m.group(1).strip()
-                raw_value = m.group(2).strip() if m.group(2) is not None else None
-                interpreted_value = interpret_value(raw_value, None)
-
-                config = ValueConfig(
-                    identifier=identifier,
-                    replacement_start=match_start,
-                    replacement_end=match_end,
-                    in_template_value=interpreted_value,
-                    yaml_value=NOT_DEFINED,
-                    cli_value=NOT_DEFINED
-                )
-                configs.append(config)
-
-        offset += len(line)
+    for token in tokens:
+        if token.token_type != TokenType.CONFIG:
+            continue
+        raw_value = token.value.strip() if token.value is not None else None
+        configs.append(ValueConfig(
+            identifier=token.identifier,
+            replacement_start=token.start,
+            replacement_end=token.end,
+            in_template_value=interpret_value(raw_value, token.quote),
+            yaml_value=NOT_DEFINED,
+            cli_value=NOT_DEFINED
+        ))
 
     return configs
 
 
-
 def fetch_yaml_configs(configs: list[ValueConfig], yaml_data: dict):
     for config in configs:
         if isinstance(yaml_data, dict) and "config" in yaml_data:
@@ -1,9 +1,10 @@
-import collections
 import os
 from enum import Enum
-from typing import Union, List, Tuple, Optional
+from typing import Union, List, Optional, Dict, Iterator, Iterable
 
+from boilergen.builder.file_registry import TemplateFileRegistry, as_registry
 from boilergen.builder.parser.tags import TemplateFile
+from boilergen.builder.source_cache import SourceCache, default_source_cache
 from boilergen.cli.run_config import RunConfig
 
 
@@ -91,220 +92,270 @@ def parse_injections(yaml_data: dict, yaml_file_path: str) -> List[Injection]:
     return injections
 
 
-def find_template_file(template_files: List[TemplateFile], injection: Injection, output_path: str) -> Optional[
-    TemplateFile]:
-    """Find the template file that matches the injection's target file path."""
-    target_path = os.path.normpath(os.path.join(output_path, injection.target_file))
+class InjectionRegistry:
+    """Injections of a single generation run, parsed once per injections.yaml and indexed by target file."""
 
-    for template_file in template_files:
-        candidate_path = os.path.normpath(os.path.join(output_path, template_file.destination_path))
-        if candidate_path == target_path:
-            return template_file
-    return None
+    def __init__(self):
+        self._by_target_file: Dict[str, List[Injection]] = {}
+        self._loaded_definitions = set()
 
+    def load(self, yaml_data: dict, yaml_file_path: str):
+        """Parse the injection definitions of one injections.yaml, files that were already loaded are ignored."""
+        key = os.path.normpath(yaml_file_path)
+        if key in self._loaded_definitions:
+            return
+        self._loaded_definitions.add(key)
+        self.add(parse_injections(yaml_data, yaml_file_path))
 
-def run_injections(template_files: List[TemplateFile], run_config: RunConfig, output_path: str):
-    """Execute all injections, processing them by target file to maintain consistency."""
-    # Collect unique injections by target file
-    visited_injections = set()
-    injections_by_file = collections.defaultdict(list)
+    def add(self, injections: Iterable[Injection]):
+        for injection in injections:
+            self._by_target_file.setdefault(os.path.normpath(injection.target_file), []).append(injection)
 
-    for template_file in template_files:
-        for injection in template_file.injections:
-            if injection in visited_injections:
-                continue
-            visited_injections.add(injection)
-            injections_by_file[injection.target_file].append((template_file, injection))
+    def by_target_file(self) -> Dict[str, List[Injection]]:
+        """Injections grouped by normalized target file, in definition order."""
+        return self._by_target_file
 
-    # Process each target file
-    for target_file_path, file_injections in injections_by_file.items():
-        process_file_injections(target_file_path, file_injections, template_files, output_path, run_config)
+    def targets(self, target_file: str) -> List[Injection]:
+        return self._by_target_file.get(os.path.normpath(target_file), [])
 
+    def __iter__(self) -> Iterator[Injection]:
+        for injections in self._by_target_file.values():
+            yield from injections
 
-def process_file_injections(target_file_path: str, file_injections: List[Tuple],
-                            template_files: List[TemplateFile], output_path: str, run_config: RunConfig):
-    """Process all injections for a single target file."""
-    full_file_path = os.path.join(output_path, target_file_path)
+    def __len__(self):
+        return sum(len(injections) for injections in self._by_target_file.values())
 
-    template_file_of_target = None
-    for template_file in template_files:
-        if os.path.normpath(template_file.destination_path) == os.path.normpath(full_file_path):
-            template_file_of_target = template_file
-            break
-    
-    if not template_file_of_target:
-        if run_config.debug_manager:
-            run_config.debug_manager.state_change("error", f"Injection target file not found: {target_file_path}")
-        return
+    @classmethod
+    def from_template_files(cls, template_files: List[TemplateFile]) -> 'InjectionRegistry':
+        """Collect the unique injections attached to the given template files."""
+        registry = cls()
+        visited_injections = set()
+        for template_file in template_files:
+            for injection in template_file.injections:
+                if injection in visited_injections:
+                    continue
+                visited_injections.add(injection)
+                registry.add([injection])
+        return registry
 
-    # Read target file
-    content_lines = template_file_of_target.content.splitlines()
 
-    # Sort injections by position (line-based first, then tag-based)
-    # We sort descending so that applying one doesn't shift the positions of the ones that come BEFORE it.
-    # Actually, the logic updates tag positions in TemplateFile objects, so we can go ascending.
-    # But if multiple injections target the SAME line number directly (unlikely but possible), sorting matters.
-    def get_injection_position(injection_tuple):
-        template_file, injection = injection_tuple
+def find_template_file(template_files: List[TemplateFile], injection: Injection, output_path: str) -> Optional[
+    TemplateFile]:
+    """Find the template file that matches the injection's target file path."""
+    return as_registry(template_files).resolve(output_path, injection.target_file)
 
-        if injection.line is not None:
-            return (0, injection.line)
 
-        if injection.target_tag is not None:
-            target_template = find_template_file(template_files, injection, output_path)
-            if target_template:
-                for tag in target_template.tags:
-                    if str(tag.tag_identifier) == str(injection.target_tag):
-                        return (1, tag.line_start)
+def run_injections(template_files: List[TemplateFile], run_config: RunConfig, output_path: str,
+                   source_cache: Optional[SourceCache] = None) -> List['InjectionPlan']:
+    """Execute all injections, processing them by target file to maintain consistency."""
+    if source_cache is None:
+        source_cache = default_source_cache
+    hits_before, misses_before = source_cache.hits, source_cache.misses
+    template_files = as_registry(template_files)
+    injections = template_files.injections
+    if injections is None:
+        # Template files that were not built by prepare_objects carry their injections themselves
+        injections = InjectionRegistry.from_template_files(template_files)
+
+    # Process each target file
+    plans = []
+    for target_file_path, file_injections in injections.by_target_file().items():
+        plan = process_file_injections(target_file_path, file_injections, template_files, output_path, run_config,
+                                       source_cache)
+        if plan is not None:
+            plans.append(plan)
+
+    if run_config.debug_manager:
+        hits = source_cache.hits - hits_before
+        misses = source_cache.misses - misses_before
+        hit_rate = hits / (hits + misses) if hits + misses else 0.0
+        run_config.debug_manager.state_change(
+            "injections", f"Injection source cache: {hits} hits, {misses} misses ({hit_rate:.0%} hit rate)")
+    return plans
+
+
+def process_file_injections(target_file_path: str, file_injections: List[Injection],
+                            template_files: TemplateFileRegistry, output_path: str, run_config: RunConfig,
+                            source_cache: Optional[SourceCache] = None) -> Optional['InjectionPlan']:
+    """Compile all injections for a single target file into a plan and apply it in one pass."""
+    template_file_of_target = template_files.resolve(output_path, target_file_path)
 
-        return (2, 0)
+    if not template_file_of_target:
+        if run_config.debug_manager:
+            run_config.debug_manager.state_change("error", f"Injection target file not found: {target_file_path}")
+        return None
 
-    file_injections.sort(key=get_injection_position)
+    if template_file_of_target.line_map:
+        # Edits of an earlier plan are pending, plans are compiled against freshly indexed positions
+        template_file_of_target.reindex()
 
-    # Apply each injection
-    for template_file, injection in file_injections:
-        # Read source content
+    content_lines = template_file_of_target.content.splitlines()
+    plan = compile_injection_plan(target_file_path, template_file_of_target, len(content_lines), file_injections,
+                                  source_cache)
+
+    if run_config.debug_manager:
+        run_config.debug_manager.state_change("injections", plan.explain())
+
+    template_file_of_target.content = "\n".join(plan.apply(content_lines, template_file_of_target))
+    return plan
+
+
+class PlannedInjection:
+    """An injection resolved to the slice [start:end) of the original, 0-based target lines it replaces."""
+    # Inserts at the same gap are ordered by the line they are attached to, then by definition order, except for
+    # stacked methods whose injections come out in reverse definition order
+    ATTACHED_ABOVE = 0
+    ATTACHED_BELOW = 1
+    REPLACEMENT = 2
+
+    def __init__(self, injection: Injection, order: int, start: int, end: int, rank: int, anchor: str,
+                 source_lines, stacked: bool = False):
+        self.injection = injection
+        self.order = order
+        self.start = start
+        self.end = end
+        self.rank = rank
+        self.anchor = anchor
+        self.source_lines = source_lines
+        self.stacked = stacked
+        self.conflict: Optional[str] = None
+
+    @property
+    def sort_key(self):
+        return self.start, self.rank, -self.order if self.stacked else self.order
+
+    def describe(self) -> str:
+        if self.end > self.start:
+            position = f"replace lines {self.start + 1}-{self.end}"
+        elif self.start == 0:
+            position = "insert at start of file"
+        else:
+            position = f"insert after line {self.start}"
+        return f"{position}: {len(self.source_lines)} line(s) from {self.injection.source_file} ({self.anchor})"
+
+
+class InjectionPlan:
+    """All injections of one target file, resolved against the original line and tag positions."""
+
+    def __init__(self, target_file_path: str):
+        self.target_file_path = target_file_path
+        self.steps: List[PlannedInjection] = []
+        self.skipped: List[PlannedInjection] = []
+        self.unresolved: List[tuple] = []  # (injection, reason)
+
+    def add(self, step: PlannedInjection):
+        self.steps.append(step)
+
+    def finalize(self):
+        """Order the steps deterministically and drop steps whose anchor is removed by a replacement."""
+        ordered = sorted(self.steps, key=lambda step: step.sort_key)
+        self.steps = []
+        replaced_start, replaced_end = 0, 0
+        for step in ordered:
+            if step.start < replaced_end:
+                step.conflict = f"anchor lies inside lines {replaced_start + 1}-{replaced_end} replaced by an earlier injection"
+                self.skipped.append(step)
+                continue
+            self.steps.append(step)
+            if step.end > step.start:
+                replaced_start, replaced_end = step.start, step.end
+
+    def apply(self, content_lines: List[str], edited_file: Optional[TemplateFile] = None) -> List[str]:
+        """Merge all steps into the original lines in a single pass and record the line edits."""
+        result = []
+        cursor = 0
+        for step in self.steps:
+            result.extend(content_lines[cursor:step.start])
+            result.extend(step.source_lines)
+            cursor = max(step.start, step.end)
+        result.extend(content_lines[cursor:])
+
+        if edited_file is not None:
+            for step in self.steps:
+                edited_file.record_line_edit(step.start, step.end - step.start, len(step.source_lines))
+        return result
+
+    def explain(self) -> str:
+        lines = [f"Injection plan for {self.target_file_path} ({len(self.steps)} step(s))"]
+        for i, step in enumerate(self.steps, start=1):
+            lines.append(f"  {i}. {step.describe()}")
+        for step in self.skipped:
+            lines.append(f"  skipped: {step.describe()} - {step.conflict}")
+        for injection, reason in self.unresolved:
+            lines.append(f"  skipped: {injection.source_file} - {reason}")
+        return "\n".join(lines)
+
+
+def compile_injection_plan(target_file_path: str, target_file: TemplateFile, line_count: int,
+                           injections: List[Injection], source_cache: Optional[SourceCache] = None) -> InjectionPlan:
+    """Resolve every injection against the original positions of the target file."""
+    if source_cache is None:
+        source_cache = default_source_cache
+    plan = InjectionPlan(target_file_path)
+
+    for order, injection in enumerate(injections):
+        resolved = resolve_injection_range(injection, target_file, line_count)
+        if isinstance(resolved, str):
+            plan.unresolved.append((injection, resolved))
+            continue
+
+        start, end, rank, anchor = resolved
         source_path = os.path.join(injection.injection_definition_location, injection.source_file)
-        with open(source_path, "r") as f:
-            source_lines = f.read().splitlines()
+        plan.add(PlannedInjection(injection, order, start, end, rank, anchor, source_cache.get_lines(source_path),
+                                  is_stacked(injection)))
+
+    plan.finalize()
+    return plan
 
-        # Apply injection
-        if run_config.debug_manager:
-            run_config.debug_manager.state_change("injections", f"Applying injection to {target_file_path} from {injection.source_file} using {injection.method}")
-        
-        content_lines = apply_injection(content_lines, injection, source_lines, template_files, output_path, run_config)
 
-        # Update tag positions after injection
-        update_tag_positions(template_file, injection, len(source_lines), template_files, output_path, run_config)
+def is_stacked(injection: Injection) -> bool:
+    """
+    Whether several injections at the same spot come out in reverse definition order.
 
-    template_file_of_target.content = "\n".join(content_lines)
+    Injections used to be applied one at a time, and for these methods every later one was inserted at the same
+    index as the earlier ones. Plans keep that order so existing templates generate the same files.
+    """
+    if injection.line is not None:
+        return injection.method in (InjectionMethod.BEFORE, InjectionMethod.AFTER)
+    return injection.method in (InjectionMethod.AFTER, InjectionMethod.START)
 
 
-def apply_injection(content_lines: List[str], injection: Injection, source_lines: List[str],
-                    template_files: List[TemplateFile], output_path: str, run_config: RunConfig) -> List[str]:
-    """Apply a single injection to the content lines."""
+def resolve_injection_range(injection: Injection, target_file: TemplateFile, line_count: int):
+    """Return (start, end, rank, anchor) in original 0-based line coordinates, or the reason it can't be resolved."""
+    method = injection.method
+    above, below = PlannedInjection.ATTACHED_ABOVE, PlannedInjection.ATTACHED_BELOW
 
     # Line-based injection (1-based from config)
     if injection.line is not None:
-        line_idx = injection.line - 1 # Convert to 0-based
-        method = injection.method
-        
-        if run_config.debug_manager:
-            run_config.debug_manager.state_change("injections", f"Line-based injection at line {injection.line} (index {line_idx}, method: {method})")
-
+        idx = max(0, min(injection.line - 1, line_count))
+        anchor = f"line {injection.line}, {method.value}"
+        enclosing = target_file.enclosing_tags(injection.line)
+        if enclosing:
+            anchor += f", inside tag '{enclosing[-1].tag_identifier}'"
         if method == InjectionMethod.REPLACE:
-            content_lines[line_idx:line_idx + 1] = source_lines
-        elif method == InjectionMethod.BEFORE:
-            content_lines[line_idx:line_idx] = source_lines
-        elif method == InjectionMethod.AFTER:
-            content_lines[line_idx + 1:line_idx + 1] = source_lines
-
-        return content_lines
-
-    # Tag-based injection
-    if injection.target_tag is not None:
-        target_template = find_template_file(template_files, injection, output_path)
-        if not target_template:
-            if run_config.debug_manager:
-                run_config.debug_manager.state_change("injections", f"Target template for tag '{injection.target_tag}' not found.")
-            return content_lines
-
-        # Find tag bounds (1-based from extract_tags)
-        tag_start, tag_end = None, None
-        for tag in target_template.tags:
-            if str(tag.tag_identifier) == str(injection.target_tag):
-                tag_start, tag_end = tag.line_start, tag.line_end
-                break
-
-        if tag_start is None:
-            if run_config.debug_manager:
-                run_config.debug_manager.state_change("injections", f"Tag '{injection.target_tag}' not found in target template.")
-            return content_lines
-
-        method = injection.method
-        if run_config.debug_manager:
-            run_config.debug_manager.state_change("injections", f"Tag-based injection at tag '{injection.target_tag}' (lines: {tag_start}-{tag_end}, method: {method})")
-            
-        # Convert to 0-based indices for slicing
-        # content_lines is a list from splitlines()
-        idx_start = tag_start - 1
-        idx_end = tag_end # Exclusive end for slice includes line tag_end (which is index tag_end - 1)
-        
-        if method == InjectionMethod.REPLACE:
-            content_lines[idx_start:idx_end] = source_lines
-        elif method == InjectionMethod.BEFORE:
-            content_lines[idx_start:idx_start] = source_lines
-        elif method == InjectionMethod.AFTER:
-            content_lines[idx_end:idx_end] = source_lines
-        elif method == InjectionMethod.START:
-            # Inside the tag, after the opening tag line
-            content_lines[idx_start + 1:idx_start + 1] = source_lines
-        elif method == InjectionMethod.END:
-            # Inside the tag, before the closing tag line
-            content_lines[idx_end - 1:idx_end - 1] = source_lines
-
-    return content_lines
-
-
-def update_tag_positions(template_file: TemplateFile, injection: Injection, source_line_count: int,
-                         template_files: List[TemplateFile], output_path: str, run_config: RunConfig):
-    """Update tag positions after an injection modifies the file structure."""
-    target_template = find_template_file(template_files, injection, output_path)
-    if not target_template:
-        return
-
-    # Calculate line delta
-    method = injection.method
+            return idx, min(idx + 1, line_count), PlannedInjection.REPLACEMENT, anchor
+        if method == InjectionMethod.BEFORE:
+            return idx, idx, below, anchor
+        if method == InjectionMethod.AFTER:
+            idx = min(idx + 1, line_count)
+            return idx, idx, above, anchor
+        return f"method '{method.value}' requires a tag"
+
+    # Tag-based injection (1-based from extract_tags)
+    tag = target_file.find_tag(injection.target_tag)
+    if tag is None:
+        return f"tag '{injection.target_tag}' not found in target file"
+
+    tag_start, tag_end = tag.line_start, tag.line_end
+    anchor = f"tag '{injection.target_tag}' lines {tag_start}-{tag_end}, {method.value}"
     if method == InjectionMethod.REPLACE:
-        if injection.line is not None:
-            line_delta = source_line_count - 1  # Replacing 1 line
-        else:
-            # Replacing tag content
-            for tag in target_template.tags:
-                if str(tag.tag_identifier) == str(injection.target_tag):
-                    original_line_count = tag.line_end - tag.line_start + 1
-                    line_delta = source_line_count - original_line_count
-                    break
-            else:
-                line_delta = 0
-    else:
-        line_delta = source_line_count  # Adding lines
-
-    if run_config.debug_manager and line_delta != 0:
-        run_config.debug_manager.state_change("injections", f"Injection caused line shift of {line_delta} lines in {target_template.destination_path}")
-
-    # Get injection position for updating tags that come after
-    injection_pos = None
-    if injection.line is not None:
-        injection_pos = injection.line
-    elif injection.target_tag is not None:
-        for tag in target_template.tags:
-            if str(tag.tag_identifier) == str(injection.target_tag):
-                # Where did we insert?
-                if method == InjectionMethod.BEFORE:
-                    injection_pos = tag.line_start - 1
-                elif method == InjectionMethod.AFTER:
-                    injection_pos = tag.line_end
-                elif method == InjectionMethod.REPLACE:
-                    injection_pos = tag.line_start - 1
-                elif method == InjectionMethod.START:
-                    injection_pos = tag.line_start
-                elif method == InjectionMethod.END:
-                    injection_pos = tag.line_end - 1
-                break
-
-    if injection_pos is not None:
-        # Update all tag positions that come after the injection
-        updated_count = 0
-        for file in template_files:
-            # Only update if it's the same fileL
-            if file.destination_path == target_template.destination_path:
-                for tag in file.tags:
-                    if tag.line_start > injection_pos:
-                        tag.line_start += line_delta
-                        updated_count += 1
-                    if tag.line_end > injection_pos:
-                        tag.line_end += line_delta
-
-        if run_config.debug_manager and updated_count > 0:
-            run_config.debug_manager.state_change("injections", f"Updated {updated_count} subsequent tags in {target_template.destination_path}")
+        return tag_start - 1, tag_end, PlannedInjection.REPLACEMENT, anchor
+    if method == InjectionMethod.BEFORE:
+        return tag_start - 1, tag_start - 1, below, anchor
+    if method == InjectionMethod.AFTER:
+        return tag_end, tag_end, above, anchor
+    if method == InjectionMethod.START:
+        # Inside the tag, after the opening tag line
+        return tag_start, tag_start, above, anchor
+    # Inside the tag, before the closing tag line
+    return tag_end - 1, tag_end - 1, below, anchor
@@ -0,0 +1,58 @@
+from typing import Any, Iterable, List, Optional, Tuple
+
+Interval = Tuple[int, int, Any]  # (start, end, value), both ends inclusive
+
+
+class _Node:
+    def __init__(self, center: int, overlapping: List[Interval], left: Optional['_Node'], right: Optional['_Node']):
+        self.center = center
+        self.by_start = sorted(overlapping, key=lambda i: i[0])
+        self.by_end = sorted(overlapping, key=lambda i: i[1], reverse=True)
+        self.left = left
+        self.right = right
+
+
+class IntervalTree:
+    """Static centered interval tree answering "which intervals contain this point" in O(log n + k)."""
+
+    def __init__(self, intervals: Iterable[Interval]):
+        self._root = self._build(list(intervals))
+
+    def _build(self, intervals: List[Interval]) -> Optional[_Node]:
+        if not intervals:
+            return None
+        endpoints = sorted(point for start, end, _ in intervals for point in (start, end))
+        center = endpoints[len(endpoints) // 2]
+
+        left, right, overlapping = [], [], []
+        for interval in intervals:
+            if interval[1] < center:
+                left.append(interval)
+            elif interval[0] > center:
+                right.append(interval)
+            else:
+                overlapping.append(interval)
+        return _Node(center, overlapping, self._build(left), self._build(right))
+
+    def query(self, point: int) -> List[Any]:
+        """Values of all intervals containing point, outermost first."""
+        found: List[Interval] = []
+        node = self._root
+        while node is not None:
+            if point < node.center:
+                for interval in node.by_start:
+                    if interval[0] > point:
+                        break
+                    found.append(interval)
+                node = node.left
+            elif point > node.center:
+                for interval in node.by_end:
+                    if interval[1] < point:
+                        break
+                    found.append(interval)
+                node = node.right
+            else:
+                found.extend(node.by_start)
+                break
+        found.sort(key=lambda i: (i[0], -i[1]))
+        return [value for _, _, value in found]
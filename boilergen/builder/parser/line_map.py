@@ -0,0 +1,68 @@
+import bisect
+import itertools
+from typing import List, Optional, Tuple
+
+
+class LineShiftMap:
+    """
+    Maps 1-based line numbers of indexed content to the current content after line edits.
+
+    Edits are recorded in the coordinates of the indexed content and must not overlap, which is what an
+    injection plan produces. They are kept as a sorted shift list with cumulative deltas, so a lookup is a
+    binary search instead of a walk over every edit.
+    """
+
+    def __init__(self):
+        self._edits: List[Tuple[int, int, int]] = []  # (0-based start, removed, inserted), sorted
+        self._keys: List[Tuple[int, int]] = []
+        self._deltas: List[int] = []
+        self._dirty = False
+
+    def __len__(self):
+        return len(self._edits)
+
+    def __bool__(self):
+        return bool(self._edits)
+
+    @property
+    def edits(self) -> List[Tuple[int, int, int]]:
+        return list(self._edits)
+
+    def record(self, start: int, removed: int, inserted: int):
+        """Record that `removed` lines at 0-based index `start` were replaced by `inserted` lines."""
+        # Inserts sort in front of a replacement starting at the same line
+        bisect.insort(self._edits, (start, removed, inserted))
+        self._dirty = True
+
+    def _rebuild(self):
+        self._keys = [(start, removed) for start, removed, _ in self._edits]
+        self._deltas = list(itertools.accumulate(inserted - removed for _, removed, inserted in self._edits))
+        self._dirty = False
+
+    def map_line(self, line: int) -> Optional[int]:
+        """Return the current line number of an indexed line, or None if the line was replaced."""
+        if not self._edits:
+            return line
+        if self._dirty:
+            self._rebuild()
+
+        index = line - 1
+        i = bisect.bisect_right(self._keys, (index, float("inf"))) - 1
+        if i < 0:
+            return line
+        start, removed, _ = self._edits[i]
+        if start <= index < start + removed:
+            return None
+        return line + self._deltas[i]
+
+    def inserted_lines(self) -> List[int]:
+        """Current 1-based line numbers of all lines inserted by the recorded edits."""
+        if self._dirty:
+            self._rebuild()
+        lines = []
+        delta_before = 0
+        for (start, _, inserted), delta in zip(self._edits, self._deltas):
+            current_start = start + delta_before
+            lines.extend(range(current_start + 1, current_start + inserted + 1))
+            delta_before = delta
+        return lines
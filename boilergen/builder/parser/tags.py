@@ -1,34 +1,92 @@
-import re
-from typing import List, Union, Optional, Callable, Any
-from boilergen.builder.parser.configs import ValueConfig
+from typing import List, Union, Optional, Callable, Any, Tuple, Dict
+from boilergen.builder.parser.configs import ValueConfig, extract_configs
+from boilergen.builder.parser.interval_tree import IntervalTree
+from boilergen.builder.parser.line_map import LineShiftMap
+from boilergen.builder.parser.tokenizer import (
+    MarkerToken,
+    TokenType,
+    tokenize,
+    retokenize,
+    TAG_OPENING_REGEX,
+    TAG_CLOSING_REGEX
+)
 from boilergen.core.observable import ObservableList
 
-TAG_OPENING_REGEX = r"<<boilergen:(?!config\b)([a-zA-Z0-9_-]+)"
-TAG_CLOSING_REGEX = r"boilergen:(?!config\b)([a-zA-Z0-9_-]+)>>"
-
 
 class Tag:
     def __init__(self, tag_identifier: str, line_start: int, line_end: int):
         self.tag_identifier = tag_identifier
-        self.line_start = line_start
-        self.line_end = line_end
+        # Positions are stored in the coordinates of the indexed content, line_map translates them to current lines
+        self.origin_start = line_start
+        self.origin_end = line_end
+        self.line_map: Optional[LineShiftMap] = None
+
+    def _current(self, line: int) -> Optional[int]:
+        return self.line_map.map_line(line) if self.line_map is not None else line
+
+    @property
+    def line_start(self) -> Optional[int]:
+        """Current line of the opening marker, None if it was replaced."""
+        return self._current(self.origin_start)
+
+    @line_start.setter
+    def line_start(self, value: int):
+        self.origin_start = value
+
+    @property
+    def line_end(self) -> Optional[int]:
+        """Current line of the closing marker, None if it was replaced."""
+        return self._current(self.origin_end)
+
+    @line_end.setter
+    def line_end(self, value: int):
+        self.origin_end = value
 
     def __repr__(self):
         return f"Tag(id='{self.tag_identifier}', start={self.line_start}, end={self.line_end})"
 
 
+class TagDiagnostic:
+    """Describes a tag marker that could not be paired."""
+    UNCLOSED = "unclosed"
+    UNOPENED = "unopened"
+
+    def __init__(self, kind: str, tag_identifier: str, line: int):
+        self.kind = kind
+        self.tag_identifier = tag_identifier
+        self.line = line
+
+    def __str__(self):
+        if self.kind == TagDiagnostic.UNCLOSED:
+            return f"Tag '{self.tag_identifier}' opened at line {self.line} is never closed"
+        return f"Tag '{self.tag_identifier}' closed at line {self.line} was never opened"
+
+    def __repr__(self):
+        return f"TagDiagnostic(kind='{self.kind}', id='{self.tag_identifier}', line={self.line})"
+
+
 class TemplateFile:
     def __init__(self, content: str, tags: List[Tag], configs: List[ValueConfig], destination_path: str,
-                 injections=None, tag_change_callback: Optional[Callable[[Any,Any,Any], None]] = None):
+                 injections=None, tag_change_callback: Optional[Callable[[Any,Any,Any], None]] = None,
+                 tokens: Optional[List[MarkerToken]] = None):
         if injections is None:
             injections = []
         self.content = content
+        # Marker tokens of the indexed content and the line edits applied to it since then
+        self.tokens = tokens
+        self.line_map = LineShiftMap()
+        self._indexed_content = content if tokens is not None else None
         self.tag_change_callback = tag_change_callback
+        # Lookup structures over the tags, built lazily and dropped whenever tags or positions change
+        self._tag_index: Optional[Dict[str, Tag]] = None
+        self._tag_tree: Optional[IntervalTree] = None
         self._tags = ObservableList(tags, callback=self.on_tags_changed)
+        self._bind_tags(tags)
         self.configs = configs
         self.destination_path = destination_path
         self.injections = injections
-        
+        self.tag_diagnostics: List[TagDiagnostic] = []
+
         # Notify about initial scan if tags exist
         if tags:
             for tag in tags:
@@ -45,41 +103,137 @@ class TemplateFile:
             self._tags._callback = self.on_tags_changed
         else:
             self._tags = ObservableList(value, callback=self.on_tags_changed)
-        
+        self._bind_tags(self._tags)
+        self._invalidate_tag_lookups()
+
         # Notify about refreshed tags
         for tag in self._tags:
             self.on_tags_changed(self._tags, "refreshed", tag)
 
+    @property
+    def index_is_current(self) -> bool:
+        """True if the stored tokens still describe the current content."""
+        return self.tokens is not None and self._indexed_content is self.content
+
+    def set_tokens(self, tokens: List[MarkerToken]):
+        """Store tokens for the current content and forget all recorded line edits."""
+        self.tokens = tokens
+        self.line_map = LineShiftMap()
+        self._indexed_content = self.content
+        self._bind_tags(self._tags)
+        self._invalidate_tag_lookups()
+
+    def record_line_edit(self, start: int, removed: int, inserted: int):
+        """Record that `removed` indexed lines at 0-based index `start` were replaced by `inserted` lines."""
+        self.line_map.record(start, removed, inserted)
+        self._invalidate_tag_lookups()
+
+    def find_tag(self, tag_identifier) -> Optional[Tag]:
+        """Return the first tag with the identifier whose markers still exist."""
+        if self._tag_index is None:
+            self._tag_index = {}
+            for tag in self._tags:
+                if tag.line_start is not None and tag.line_end is not None:
+                    self._tag_index.setdefault(str(tag.tag_identifier), tag)
+        return self._tag_index.get(str(tag_identifier))
+
+    def enclosing_tags(self, line: int) -> List[Tag]:
+        """Return all tags whose region contains the 1-based line, outermost first."""
+        if self._tag_tree is None:
+            self._tag_tree = IntervalTree(
+                (tag.line_start, tag.line_end, tag) for tag in self._tags
+                if tag.line_start is not None and tag.line_end is not None
+            )
+        return self._tag_tree.query(line)
+
+    def _invalidate_tag_lookups(self):
+        self._tag_index = None
+        self._tag_tree = None
+
+    def reindex(self) -> bool:
+        """
+        Bring tokens, tags and configs in line with the current content.
+
+        Only lines touched by recorded edits are tokenized again. Returns False if the index was still current.
+        """
+        if self.index_is_current:
+            return False
+
+        if self.tokens is not None and self.line_map:
+            tokens = retokenize(self.content, self.tokens, self.line_map)
+        else:
+            tokens = tokenize(self.content)
+        self.set_tokens(tokens)
+
+        tags, self.tag_diagnostics = pair_tags(tokens)
+        self.tags = tags
+        new_configs = extract_configs(self.content, tokens=tokens)
+        old_map = {c.identifier: c for c in self.configs}
+        for nc in new_configs:
+            if nc.identifier in old_map:
+                nc.yaml_value = old_map[nc.identifier].yaml_value
+                nc.cli_value = old_map[nc.identifier].cli_value
+        self.configs = new_configs
+        return True
+
+    def _bind_tags(self, tags):
+        for tag in tags:
+            tag.line_map = self.line_map
+
     def on_tags_changed(self, *args):
+        _, action, item = args
+        if action in ("append", "set"):
+            self._bind_tags([item])
+        elif action == "extend":
+            self._bind_tags(self._tags)
+        self._invalidate_tag_lookups()
         if self.tag_change_callback:
             self.tag_change_callback(self, *args)
 
-def extract_tags(file_content: str, debug_manager=None):
-    opening_tags = []
-    closing_tags = []
+def pair_tags(tokens: List[MarkerToken]) -> Tuple[List[Tag], List[TagDiagnostic]]:
+    """
+    Pair opening and closing tag tokens in a single pass.
 
-    for line_number, line in enumerate(file_content.splitlines(), start=1):
-        open_match = re.search(TAG_OPENING_REGEX, line)
-        if open_match:
-            identifier = open_match.group(1)
-            opening_tags.append((identifier, line_number))
+    Every identifier gets its own stack, so nested regions reusing an identifier close innermost first.
+    Tags are returned in the order they were opened, unbalanced markers are returned as diagnostics.
+    """
+    opened: List[List] = []  # [identifier, line_start, line_end]
+    stacks: Dict[str, List[int]] = {}
+    diagnostics = []
 
-        close_match = re.search(TAG_CLOSING_REGEX, line)
-        if close_match:
-            identifier = close_match.group(1)
-            closing_tags.append((identifier, line_number))
+    for token in tokens:
+        if token.token_type == TokenType.TAG_OPEN:
+            stacks.setdefault(token.identifier, []).append(len(opened))
+            opened.append([token.identifier, token.line, None])
+        elif token.token_type == TokenType.TAG_CLOSE:
+            stack = stacks.get(token.identifier)
+            if stack:
+                opened[stack.pop()][2] = token.line
+            else:
+                diagnostics.append(TagDiagnostic(TagDiagnostic.UNOPENED, token.identifier, token.line))
 
     tags = []
-    for identifier, start_line in opening_tags:
-        for i, (closing_identifier, end_line) in enumerate(closing_tags):
-            if closing_identifier == identifier:
-                tags.append(Tag(identifier, start_line, end_line))
-                del closing_tags[i]
-                break
-    
+    for identifier, line_start, line_end in opened:
+        if line_end is None:
+            diagnostics.append(TagDiagnostic(TagDiagnostic.UNCLOSED, identifier, line_start))
+        else:
+            tags.append(Tag(identifier, line_start, line_end))
+
+    diagnostics.sort(key=lambda d: d.line)
+    return tags, diagnostics
+
+
+def extract_tags(file_content: str, debug_manager=None, tokens: Optional[List[MarkerToken]] = None):
+    if tokens is None:
+        tokens = tokenize(file_content)
+
+    tags, diagnostics = pair_tags(tokens)
+
     if debug_manager:
         debug_manager.state_change("tags", f"Scanned content and found {len(tags)} tags")
         for tag in tags:
             debug_manager.state_change("tags", f"Found tag: {tag}")
-            
+        for diagnostic in diagnostics:
+            debug_manager.state_change("tags", f"Unbalanced tag: {diagnostic}")
+
     return tags
@@ -0,0 +1,152 @@
+import itertools
+import re
+from enum import Enum
+from typing import List, Tuple
+
+from boilergen.builder.parser.line_map import LineShiftMap
+
+MARKER_PREFIX = "boilergen:"
+CONFIG_PREFIX = "boilergen:config"
+
+TAG_OPENING_REGEX = r"<<boilergen:(?!config\b)([a-zA-Z0-9_-]+)"
+TAG_CLOSING_REGEX = r"boilergen:(?!config\b)([a-zA-Z0-9_-]+)>>"
+CONFIG_REGEX = (
+    r'boilergen:config\s*\|\s*'
+    r'([^\s|]+)'  # identifier
+    r'(?:\s*\|\s*'
+    r'([^"\']*(?:"[^"]*"|\'[^\']*\'[^"\']*)*)'  # optional value (may contain quoted parts)
+    r')?'
+)
+
+_TAG_OPENING_PATTERN = re.compile(TAG_OPENING_REGEX)
+_TAG_CLOSING_PATTERN = re.compile(TAG_CLOSING_REGEX)
+_CONFIG_PATTERN = re.compile(CONFIG_REGEX)
+
+
+class TokenType(Enum):
+    TAG_OPEN = "tag_open"
+    TAG_CLOSE = "tag_close"
+    CONFIG = "config"
+
+
+class MarkerToken:
+    """A single boilergen marker found in a file, with absolute character offsets and its 1-based line."""
+
+    def __init__(self, token_type: TokenType, identifier: str, line: int, start: int, end: int,
+                 value: str = None, quote: str = None):
+        self.token_type = token_type
+        self.identifier = identifier
+        self.line = line
+        self.start = start
+        self.end = end
+        self.value = value
+        self.quote = quote
+
+    def __repr__(self):
+        return f"MarkerToken({self.token_type.value}, id='{self.identifier}', line={self.line}, start={self.start}, end={self.end})"
+
+
+def tokenize(file_content: str) -> List[MarkerToken]:
+    """Scan the content once and return all tag and config markers in line order."""
+    tokens = []
+    if MARKER_PREFIX not in file_content:
+        return tokens
+
+    offset = 0
+    for line_number, line in enumerate(file_content.splitlines(keepends=True), start=1):
+        if MARKER_PREFIX in line:
+            tokens.extend(tokenize_line(line, line_number, offset))
+        offset += len(line)
+    return tokens
+
+
+def retokenize(file_content: str, tokens: List[MarkerToken], line_map: LineShiftMap) -> List[MarkerToken]:
+    """
+    Re-index content after line edits without rescanning every line.
+
+    Only lines that held a marker before the edits and lines inserted by the edits are tokenized again,
+    everything else is known to be marker free.
+    """
+    lines_to_scan = set(line_map.inserted_lines())
+    for token in tokens:
+        line_number = line_map.map_line(token.line)
+        if line_number is not None:
+            lines_to_scan.add(line_number)
+
+    lines = file_content.splitlines(keepends=True)
+    offsets = [0, *itertools.accumulate(len(line) for line in lines)]
+    new_tokens = []
+    for line_number in sorted(lines_to_scan):
+        if not 1 <= line_number <= len(lines):
+            continue
+        line = lines[line_number - 1]
+        if MARKER_PREFIX in line:
+            new_tokens.extend(tokenize_line(line, line_number, offsets[line_number - 1]))
+    return new_tokens
+
+
+def tokenize_line(line: str, line_number: int, offset: int) -> List[MarkerToken]:
+    """Tokenize a single line (including its line ending) that starts at the absolute offset."""
+    tokens = []
+
+    open_match = _TAG_OPENING_PATTERN.search(line)
+    if open_match:
+        tokens.append(MarkerToken(TokenType.TAG_OPEN, open_match.group(1), line_number,
+                                  offset + open_match.start(), offset + open_match.end()))
+
+    close_match = _TAG_CLOSING_PATTERN.search(line)
+    if close_match:
+        tokens.append(MarkerToken(TokenType.TAG_CLOSE, close_match.group(1), line_number,
+                                  offset + close_match.start(), offset + close_match.end()))
+
+    if CONFIG_PREFIX not in line:
+        return tokens
+
+    in_quotes = _find_quoted_ranges(line)
+
+    # 1. Matches **within quotes**
+    for start_quote, end_quote, quote_char in in_quotes:
+        inner_content = line[start_quote + 1:end_quote]
+        for m in _CONFIG_PATTERN.finditer(inner_content):
+            tokens.append(_config_token(m, line_number, offset + start_quote + 1, quote_char))
+
+    # 2. Matches **outside of quotes**
+    for m in _CONFIG_PATTERN.finditer(line):
+        if not any(start <= m.start() < end + 1 for start, end, _ in in_quotes):
+            tokens.append(_config_token(m, line_number, offset, None))
+
+    return tokens
+
+
+def _config_token(match: re.Match, line_number: int, base: int, quote_char) -> MarkerToken:
+    return MarkerToken(
+        TokenType.CONFIG,
+        match.group(1).strip(),
+        line_number,
+        base + match.start(),
+        base + match.end(),
+        value=match.group(2),
+        quote=quote_char
+    )
+
+
+def _find_quoted_ranges(line: str) -> List[Tuple[int, int, str]]:
+    """Return (start, end, quote_char) for every closed quoted section of the line."""
+    in_quotes = []
+    i = 0
+    while i < len(line):
+        if line[i] in ('"', "'"):
+            quote_char = line[i]
+            start_quote = i
+            i += 1
+            while i < len(line) and line[i] != quote_char:
+                if line[i] == '\\':
+                    i += 2
+                else:
+                    i += 1
+            if i < len(line):
+                in_quotes.append((start_quote, i, quote_char))
+            i += 1
+        else:
+            i += 1
+    return in_quotes
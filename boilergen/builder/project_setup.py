@@ -1,22 +1,21 @@
+import codecs
 import collections
+import os
 from pathlib import Path
 import time
-from typing import List, Dict, Optional, Any
-import yaml
-from tqdm import tqdm
-import rainbow_tqdm
-from prompt_toolkit import Application
-from prompt_toolkit.key_binding import KeyBindings
-from prompt_toolkit.layout import Layout
-from prompt_toolkit.layout.containers import HSplit
-from prompt_toolkit.styles import Style
-from prompt_toolkit.widgets import TextArea, Label
-
-from boilergen.builder.parser.injections import parse_injections, run_injections
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Any, Iterator, Tuple, Callable
+
+from boilergen.builder.parser.injections import InjectionRegistry, run_injections
+from boilergen.builder.file_registry import TemplateFileRegistry, normalize_destination
 from boilergen.builder.generation_logic import generate_file_content_data
 from boilergen.builder.parser.configs import extract_configs, fetch_yaml_configs, NOT_DEFINED
-from boilergen.builder.parser.tags import TemplateFile, extract_tags
+from boilergen.builder.parse_cache import parse_content
+from boilergen.builder.writer import StreamWriter, WriteStats, copy_files, write_files
+from boilergen.builder.parser.tags import TemplateFile
+from boilergen.builder.parser.tokenizer import MARKER_PREFIX
 from boilergen.core.template import Template
+from boilergen.core.yaml_loader import load_yaml_file
 from boilergen.core.ui import get_ui
 from boilergen.cli.run_config import RunConfig
 
@@ -49,99 +48,223 @@ def sort_templates_by_dependencies(templates: List[Template], strict: bool = Tru
     return [id_map[tid] for tid in sorted_ids]
 
 
-def prepare_objects(output_path: Path, selected_templates: List[Template], run_config: RunConfig):
-    """Scan selected templates and prepare TemplateFile objects."""
+def prepare_objects(output_path: Path, selected_templates: List[Template], run_config: RunConfig,
+                    stream: Optional[Callable[[TemplateFile], None]] = None):
+    """
+    Scan selected templates and prepare TemplateFile objects.
+
+    With a stream callback, files that are not the target of any injection are handed to it as soon as they are
+    parsed instead of being kept, only injection targets end up in the returned registry.
+    """
 
     def on_tag_change(tf: TemplateFile,full_tag_list, action, *args):
         if run_config.debug_manager:
             run_config.debug_manager.state_change("tags",tf,full_tag_list,action,*args)
-    template_files = []
+    template_files = TemplateFileRegistry()
+    template_files.injections = InjectionRegistry()
     
     if run_config.debug_manager:
         run_config.debug_manager.state_change("general", f"Sorting {len(selected_templates)} templates by dependencies.")
         
     sorted_templates = sort_templates_by_dependencies(selected_templates, not run_config.disable_dependencies)
 
+    # Walk all templates first, so the file reads of every template can be overlapped on the reader pool
+    walked = []
     for template in sorted_templates:
-        if run_config.debug_manager:
-            run_config.debug_manager.state_change("general", f"Processing template: {template.id}")
-            
         template_path = Path(template.path)
         yaml_path = template_path / "template.yaml"
         if not yaml_path.is_file():
             raise FileNotFoundError(f"'template.yaml' not found in {template_path}")
+        walked.append((template, template_path, collect_template_files(template_path, output_path)))
+
+    # Injection definitions are loaded up front, streaming has to know the targets before the first file is parsed
+    for template, template_path, _ in walked:
+        injections_yaml = template_path / "injections;" / "injections.yaml"
+        if injections_yaml.is_file():
+            if run_config.debug_manager:
+                run_config.debug_manager.state_change("general", f"Loading injections for {template.id}")
+            template_files.injections.load(load_yaml_file(injections_yaml), str(injections_yaml))
+    injection_targets = {
+        normalize_destination(os.path.join(output_path, target)) for target in template_files.injections.by_target_file()
+    }
 
-        with open(yaml_path, "r", encoding="utf-8") as f:
-            yaml_data = yaml.safe_load(f)
+    def read(item: Tuple[Path, Path]) -> Optional[str]:
+        source, dest_path = item
+        # Injection targets always need their text, everything else may be copied without decoding
+        return read_template_file(source, text_required=normalize_destination(str(dest_path)) in injection_targets)
 
-        injections_dir = template_path / "injections;"
-        
-        # Walk through template directory
-        item: Path
-        for item in template_path.rglob("*"):
-            if not item.is_file() or item.name == "template.yaml":
+    contents = read_files([file for _, _, files in walked for file in files], read, run_config.jobs)
+
+    for template, template_path, files in walked:
+        if run_config.debug_manager:
+            run_config.debug_manager.state_change("general", f"Processing template: {template.id}")
+
+        # The manifest was parsed during discovery, its config is reused instead of reading the file again
+        yaml_data = {"config": template.config}
+
+        for item, dest_path in files:
+            content = next(contents)
+            destination = normalize_destination(str(dest_path))
+            if content is None:
+                if run_config.debug_manager:
+                    run_config.debug_manager.state_change("general", f"Copying template file unchanged: {item.name} -> {dest_path.relative_to(output_path)}")
+                # The last file claiming a destination is the one that ends up on disk
+                template_files.remove_destination(destination)
+                template_files.passthrough.pop(destination, None)
+                template_files.passthrough[destination] = (str(item), str(dest_path))
                 continue
-            
-            # Skip injections directory
-            try:
-                if item.relative_to(injections_dir): continue
-            except ValueError: pass
-
-            # Calculate destination path
-            rel_parts = item.relative_to(template_path).parts
-            if len(rel_parts) < 2: continue # Should at least have 'template/' and a filename
-            
-            abstracted_rel_path = Path(*rel_parts[1:])
-            dest_path = output_path / abstracted_rel_path
+            template_files.passthrough.pop(destination, None)
 
             if run_config.debug_manager:
-                run_config.debug_manager.state_change("general", f"Reading template file: {item.name} -> {abstracted_rel_path}")
+                run_config.debug_manager.state_change("general", f"Reading template file: {item.name} -> {dest_path.relative_to(output_path)}")
 
-            with open(item, "r", encoding="utf-8") as f:
-                content = f.read()
-            
+            tokens, tags, diagnostics = parse_content(content, run_config.parse_cache)
             tf = TemplateFile(
                 content,
-                extract_tags(content),
-                extract_configs(content),
+                tags,
+                extract_configs(content, tokens=tokens),
                 str(dest_path),
-                tag_change_callback=on_tag_change
+                tag_change_callback=on_tag_change,
+                tokens=tokens
             )
+            tf.tag_diagnostics = diagnostics
+            report_tag_diagnostics(tf, run_config)
             fetch_yaml_configs(tf.configs, yaml_data)
-            template_files.append(tf)
+            if stream is not None and destination not in injection_targets:
+                stream(tf)
+            else:
+                template_files.append(tf)
 
-        # Handle injections
-        if injections_dir.is_dir():
-            injections_yaml = injections_dir / "injections.yaml"
-            if injections_yaml.is_file():
-                if run_config.debug_manager:
-                    run_config.debug_manager.state_change("general", f"Loading injections for {template.id}")
-                with open(injections_yaml, "r", encoding="utf-8") as f:
-                    inj_data = yaml.safe_load(f)
-                for tf in template_files:
-                    new_injections = parse_injections(inj_data, str(injections_yaml))
-                    tf.injections.extend(new_injections)
+    if run_config.parse_cache is not None:
+        if run_config.debug_manager:
+            cache = run_config.parse_cache
+            run_config.debug_manager.state_change(
+                "general", f"Parse cache: {cache.hits} hits, {cache.misses} misses, {len(cache)} entries.")
+        run_config.parse_cache.save()
 
     return template_files
 
 
+def collect_template_files(template_path: Path, output_path: Path) -> List[Tuple[Path, Path]]:
+    """Files of a template in walk order, paired with their destination inside output_path."""
+    injections_dir = template_path / "injections;"
+    files = []
+    item: Path
+    for item in template_path.rglob("*"):
+        if not item.is_file() or item.name == "template.yaml":
+            continue
+
+        # Skip injections directory
+        try:
+            if item.relative_to(injections_dir): continue
+        except ValueError: pass
+
+        # Calculate destination path
+        rel_parts = item.relative_to(template_path).parts
+        if len(rel_parts) < 2: continue # Should at least have 'template/' and a filename
+
+        files.append((item, output_path / Path(*rel_parts[1:])))
+    return files
+
+
+def _read_text(path: Path) -> str:
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+_MARKER_BYTES = MARKER_PREFIX.encode("utf-8")
+_READ_CHUNK_SIZE = 1 << 16
+
+
+def read_template_file(path: Path, text_required: bool = False) -> Optional[str]:
+    """
+    Return the text of a template file, or None if it can be copied unchanged.
+
+    A file is copied unchanged when it contains no boilergen marker or is not valid UTF-8, which covers images,
+    fonts, archives and plain assets. Such files are only scanned chunk by chunk and never held in memory as a
+    whole, binary files are recognized at their first invalid byte. Files with text_required set are always
+    decoded, decoding errors are raised for them.
+    """
+    if text_required:
+        return _read_text(path)
+
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    tail = b""
+    with open(path, "rb") as f:
+        try:
+            while True:
+                chunk = f.read(_READ_CHUNK_SIZE)
+                if not chunk:
+                    return None
+                # Decoded only to recognize binary files, the text is not kept before a marker shows up
+                decoder.decode(chunk)
+                # The tail of the previous chunk catches markers split across chunk boundaries
+                window = tail + chunk
+                if _MARKER_BYTES in window:
+                    break
+                tail = window[-(len(_MARKER_BYTES) - 1):]
+            f.seek(0)
+            content = f.read().decode("utf-8")
+        except UnicodeDecodeError:
+            return None
+    # Same newline handling as reading in text mode
+    return content.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def read_files(items: List[Any], read: Callable[[Any], Any] = _read_text, jobs: Optional[int] = None) -> Iterator[Any]:
+    """
+    Apply read to every item on a bounded thread pool and yield the results in the order of items.
+
+    Results are yielded as soon as they are available, so the caller processes earlier files while later ones are
+    still being read. jobs=1 reads serially on the calling thread, None uses the executor's default worker count.
+    """
+    if jobs == 1 or len(items) < 2:
+        for item in items:
+            yield read(item)
+        return
+    workers = jobs or min(32, (os.cpu_count() or 1) + 4)
+    # Only a window of reads runs ahead of the consumer, so contents do not pile up while it is busy
+    window = workers * 4
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = collections.deque()
+        for item in items:
+            pending.append(pool.submit(read, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def report_tag_diagnostics(tf: TemplateFile, run_config: RunConfig):
+    """Forward unbalanced tag markers of a file to the debug log."""
+    if run_config.debug_manager:
+        for diagnostic in tf.tag_diagnostics:
+            run_config.debug_manager.state_change("error", f"{tf.destination_path}: {diagnostic}")
+
+
 def refresh_tags_and_configs_after_injections(template_files: List[TemplateFile], run_config: RunConfig):
-    """Refresh tags and configs as content might have shifted after injections."""
+    """
+    Refresh tags and configs as content might have shifted after injections.
+
+    Files whose content was not touched keep their index, files with recorded line edits only re-index
+    the affected lines.
+    """
     if run_config.debug_manager:
         run_config.debug_manager.state_change("general", "Refreshing tags and configs after injections.")
     for tf in template_files:
-        tf.tags = extract_tags(tf.content, run_config.debug_manager)
-        new_configs = extract_configs(tf.content)
-        old_map = {c.identifier: c for c in tf.configs}
-        for nc in new_configs:
-            if nc.identifier in old_map:
-                nc.yaml_value = old_map[nc.identifier].yaml_value
-                nc.cli_value = old_map[nc.identifier].cli_value
-        tf.configs = new_configs
+        if tf.reindex():
+            report_tag_diagnostics(tf, run_config)
 
 
 def cli_config_editor(current_config: dict, file_path: str) -> dict | None:
     """Interactive editor for template configurations."""
+    from prompt_toolkit import Application
+    from prompt_toolkit.key_binding import KeyBindings
+    from prompt_toolkit.layout import Layout
+    from prompt_toolkit.layout.containers import HSplit
+    from prompt_toolkit.styles import Style
+    from prompt_toolkit.widgets import TextArea, Label
+
     initial_text = "\n".join([f"{k} = {v}" for k, v in current_config.items()])
     expected_keys = set(current_config.keys())
 
@@ -181,46 +304,91 @@ def interactive_config_editor(template_files: List[TemplateFile], ui):
     """Iterate through template files and open editor for those with configs."""
     for tf in template_files:
         if tf.configs:
-            ui.clear()
-            initial_vals = {c.identifier: (c.insertion_value if c.insertion_value != NOT_DEFINED else "") for c in tf.configs}
-            new_vals = cli_config_editor(initial_vals, tf.destination_path)
-            if new_vals is None: continue # User cancelled? Or handle error
-            for c in tf.configs:
-                if c.identifier in new_vals:
-                    c.cli_value = new_vals[c.identifier]
-                else:
-                    raise ValueError(f"Missing config value for '{c.identifier}'")
+            edit_file_configs(tf, ui)
 
 
-def create_project(output_path_str: str, selected_templates: List[Template], run_config: RunConfig):
-    """Main project generation orchestration."""
-    ui = get_ui(run_config.minimal_ui)
+def edit_file_configs(tf: TemplateFile, ui):
+    """Open the config editor for a single file and apply the entered values."""
     ui.clear()
-    ui.press_any_key("We will now step through the templates to generate your project. Press any key to continue...")
+    initial_vals = {c.identifier: (c.insertion_value if c.insertion_value != NOT_DEFINED else "") for c in tf.configs}
+    new_vals = cli_config_editor(initial_vals, tf.destination_path)
+    if new_vals is None: return # User cancelled? Or handle error
+    for c in tf.configs:
+        if c.identifier in new_vals:
+            c.cli_value = new_vals[c.identifier]
+        else:
+            raise ValueError(f"Missing config value for '{c.identifier}'")
+
+
+def apply_config_values(tf: TemplateFile, config_values: Dict[str, Any]):
+    """Use config values given up front, e.g. by a manifest, as if they were entered in the editor."""
+    for c in tf.configs:
+        if c.identifier in config_values:
+            c.cli_value = config_values[c.identifier]
+
+
+def create_project(output_path_str: str, selected_templates: List[Template], run_config: RunConfig) -> Optional[WriteStats]:
+    """Main project generation orchestration, returns what was written (None for dry runs)."""
+    ui = get_ui(run_config.minimal_ui)
+    if not run_config.headless:
+        ui.clear()
+        ui.press_any_key("We will now step through the templates to generate your project. Press any key to continue...")
 
     out_path = Path(output_path_str)
     
     if run_config.debug_manager:
         run_config.debug_manager.state_change("general", f"Starting project generation at {output_path_str}")
 
-    template_files = prepare_objects(out_path, selected_templates, run_config)
-    
+    stream_writer = None
+    stream = None
+    if run_config.stream:
+        # Files outside of injections are finished right away, only injection targets stay in memory
+        stream_writer = StreamWriter(run_config.jobs) if not run_config.dry_run else None
+
+        def stream(tf: TemplateFile):
+            if tf.configs:
+                if run_config.headless:
+                    apply_config_values(tf, run_config.config_values)
+                else:
+                    edit_file_configs(tf, ui)
+            generate_file_content_data(tf, run_config)
+            if stream_writer is None:
+                ui.display_file_content(tf.destination_path, tf.content)
+            else:
+                stream_writer.write(tf.destination_path, tf.content)
+
+    template_files = prepare_objects(out_path, selected_templates, run_config, stream)
+
     if run_config.debug_manager:
         run_config.debug_manager.state_change("general", f"Prepared {len(template_files)} template files.")
 
-    run_injections(template_files, run_config, output_path_str)
+    plans = run_injections(template_files, run_config, output_path_str)
+    if run_config.explain_injections and plans:
+        ui.display_file_content("injection-plan", "\n\n".join(plan.explain() for plan in plans), lexer="text")
+        if not run_config.headless:
+            ui.press_any_key("Injection plan displayed. Press any key to continue...")
     refresh_tags_and_configs_after_injections(template_files, run_config)
     
-    if run_config.debug_manager:
-        run_config.debug_manager.state_change("general", "Entering interactive configuration editor.")
-        
-    interactive_config_editor(template_files, ui)
+    if run_config.headless:
+        for tf in template_files:
+            apply_config_values(tf, run_config.config_values)
+    else:
+        if run_config.debug_manager:
+            run_config.debug_manager.state_change("general", "Entering interactive configuration editor.")
+        interactive_config_editor(template_files, ui)
 
     # File generation with progress bar
     if run_config.debug_manager:
         run_config.debug_manager.state_change("general", "Generating file content and removing tags.")
         
-    progress = rainbow_tqdm.tqdm(template_files) if run_config.party_mode else tqdm(template_files)
+    if run_config.headless:
+        progress = template_files
+    elif run_config.party_mode:
+        import rainbow_tqdm
+        progress = rainbow_tqdm.tqdm(template_files)
+    else:
+        from tqdm import tqdm
+        progress = tqdm(template_files)
     for tf in progress:
         generate_file_content_data(tf, run_config)
         
@@ -230,18 +398,26 @@ def create_project(output_path_str: str, selected_templates: List[Template], run
         if run_config.party_mode: time.sleep(0.1)
 
     if run_config.dry_run:
+        for source, destination in template_files.passthrough.values():
+            ui.print(f"{destination} (copied unchanged from {source})")
         ui.success("Dry run complete. No files were written.")
-        return
+        return None
 
-    ui.clear()
+    if not run_config.headless:
+        ui.clear()
     if run_config.debug_manager:
         run_config.debug_manager.state_change("general", f"Writing files to disk at {out_path}")
         
-    for tf in template_files:
-        dest = Path(tf.destination_path)
-        dest.parent.mkdir(parents=True, exist_ok=True)
-        dest.write_text(tf.content, encoding="utf-8")
-    
+    # Streamed files were produced first, their writes have to land before a later template's file replaces them
+    stats = stream_writer.close() if stream_writer is not None else WriteStats()
+    # Unchanged files go next, no rendered file shares a destination with them
+    stats = stats.merge(copy_files(template_files.passthrough.values(), run_config.link_mode, run_config.jobs))
+    stats = stats.merge(write_files(((tf.destination_path, tf.content) for tf in template_files), run_config.jobs))
+    if run_config.debug_manager:
+        run_config.debug_manager.state_change("general", f"Wrote {stats}")
+
     ui.success(f"Project generated successfully at: {out_path}")
+    ui.print(f"Wrote {stats}")
     if run_config.debug_manager:
         run_config.debug_manager.state_change("general", "Project generation finished successfully.")
+    return stats
@@ -0,0 +1,51 @@
+import os
+import threading
+from typing import Dict, Tuple
+
+
+class SourceCache:
+    """
+    Read-once cache for injection source files.
+
+    Entries are keyed by the resolved path and hold the already split lines.
+    They are revalidated against modification time and size on every lookup, so edits are picked up.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[int, int, Tuple[str, ...]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_lines(self, path: str) -> Tuple[str, ...]:
+        """Return the lines of the file at path without line endings."""
+        resolved = os.path.realpath(path)
+        stat = os.stat(resolved)
+        with self._lock:
+            entry = self._entries.get(resolved)
+            if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+                self.hits += 1
+                return entry[2]
+
+        with open(resolved, "r", encoding="utf-8") as f:
+            lines = tuple(f.read().splitlines())
+
+        with self._lock:
+            self.misses += 1
+            self._entries[resolved] = (stat.st_mtime_ns, stat.st_size, lines)
+        return lines
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Shared by all generation runs of the process, entries stay valid as long as the files do not change
+default_source_cache = SourceCache()
@@ -0,0 +1,204 @@
+import collections
+import os
+import shutil
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from enum import Enum
+from typing import Dict, Iterable, Optional, Tuple
+
+# ioctl request that clones the extents of one file into another on Linux (btrfs, XFS, ...)
+FICLONE = 0x40049409
+
+
+class LinkMode(Enum):
+    COPY = "copy"
+    REFLINK = "reflink"
+    HARDLINK = "hardlink"
+
+
+class WriteStats:
+    """Throughput of one write_files call."""
+
+    def __init__(self, files: int = 0, bytes_written: int = 0, seconds: float = 0.0):
+        self.files = files
+        self.bytes_written = bytes_written
+        self.seconds = seconds
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes_written / self.seconds if self.seconds > 0 else 0.0
+
+    def merge(self, other: 'WriteStats') -> 'WriteStats':
+        return WriteStats(self.files + other.files, self.bytes_written + other.bytes_written,
+                          self.seconds + other.seconds)
+
+    def __str__(self):
+        return (f"{self.files} files, {format_bytes(self.bytes_written)} in {self.seconds:.2f}s "
+                f"({self.files_per_second:.0f} files/s, {format_bytes(self.bytes_per_second)}/s)")
+
+
+def format_bytes(amount: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if amount < 1024:
+            return f"{amount:.0f} {unit}" if unit == "B" else f"{amount:.1f} {unit}"
+        amount /= 1024
+    return f"{amount:.1f} GiB"
+
+
+def _encode(content: str) -> bytes:
+    # Same result as writing in text mode, which translates newlines to the platform convention
+    if os.linesep != "\n":
+        content = content.replace("\n", os.linesep)
+    return content.encode("utf-8")
+
+
+def _write(item: Tuple[str, bytes]) -> int:
+    path, data = item
+    with open(path, "wb") as f:
+        f.write(data)
+    return len(data)
+
+
+def write_files(files: Iterable[Tuple[str, str]], jobs: Optional[int] = None) -> WriteStats:
+    """
+    Write (path, content) pairs as UTF-8 text.
+
+    Every distinct parent directory is created once up front, then the files are written on a thread pool limited
+    to jobs workers (1 writes serially). If a path occurs more than once the last content wins, like it did when
+    files were written one after another.
+    """
+    start = time.perf_counter()
+    latest = {}
+    for path, content in files:
+        latest[os.path.normpath(path)] = content
+
+    for parent in sorted({os.path.dirname(path) for path in latest}):
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+
+    items = [(path, _encode(content)) for path, content in latest.items()]
+    if jobs == 1 or len(items) < 2:
+        written = sum(map(_write, items))
+    else:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            written = sum(pool.map(_write, items))
+    return WriteStats(len(items), written, time.perf_counter() - start)
+
+
+class StreamWriter:
+    """
+    Writes files one by one as they are produced.
+
+    Writes run on a thread pool, but only a few of them may be in flight, so a producer that is faster than the
+    disk does not end up buffering the whole project. Parent directories are created once per writer, and a path
+    that is written again waits for its previous write, so the last write wins.
+    """
+
+    def __init__(self, jobs: Optional[int] = None):
+        workers = jobs or min(32, (os.cpu_count() or 1) + 4)
+        self._pool = ThreadPoolExecutor(max_workers=workers) if jobs != 1 else None
+        self._max_in_flight = workers * 2
+        self._in_flight: "collections.deque[Tuple[str, Future]]" = collections.deque()
+        self._by_path: Dict[str, Future] = {}
+        self._parents = set()
+        self._start = time.perf_counter()
+        self.stats = WriteStats()
+
+    def write(self, path: str, content: str):
+        path = os.path.normpath(path)
+        parent = os.path.dirname(path)
+        if parent and parent not in self._parents:
+            os.makedirs(parent, exist_ok=True)
+            self._parents.add(parent)
+
+        item = (path, _encode(content))
+        if self._pool is None:
+            self._account(_write(item))
+            return
+
+        previous = self._by_path.get(path)
+        if previous is not None:
+            previous.result()
+        future = self._pool.submit(_write, item)
+        self._by_path[path] = future
+        self._in_flight.append((path, future))
+        while len(self._in_flight) > self._max_in_flight:
+            self._finish_oldest()
+
+    def _finish_oldest(self):
+        path, future = self._in_flight.popleft()
+        self._account(future.result())
+        if self._by_path.get(path) is future:
+            del self._by_path[path]
+
+    def _account(self, written: int):
+        self.stats.files += 1
+        self.stats.bytes_written += written
+
+    def close(self) -> WriteStats:
+        """Wait for all pending writes and return the stats of everything this writer wrote."""
+        while self._in_flight:
+            self._finish_oldest()
+        if self._pool is not None:
+            self._pool.shutdown()
+        self.stats.seconds = time.perf_counter() - self._start
+        return self.stats
+
+
+def _reflink(source: str, destination: str) -> bool:
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return True
+        except OSError:
+            return False
+
+
+def copy_file(source: str, destination: str, link_mode: LinkMode = LinkMode.COPY) -> int:
+    """
+    Copy source to destination without decoding it and return the number of bytes it holds.
+
+    Reflinks and hardlinks fall back to a regular copy where the file system does not support them.
+    shutil.copyfile already lets the kernel move the data (sendfile, copy_file_range) where it can.
+    """
+    size = os.stat(source).st_size
+    if link_mode is LinkMode.HARDLINK:
+        try:
+            if os.path.lexists(destination):
+                os.remove(destination)
+            os.link(source, destination)
+            return size
+        except OSError:
+            pass
+    elif link_mode is LinkMode.REFLINK and _reflink(source, destination):
+        return size
+    shutil.copyfile(source, destination)
+    return size
+
+
+def copy_files(files: Iterable[Tuple[str, str]], link_mode: LinkMode = LinkMode.COPY,
+               jobs: Optional[int] = None) -> WriteStats:
+    """Copy (source, destination) pairs unchanged, creating every distinct parent directory once."""
+    start = time.perf_counter()
+    items = list(files)
+    for parent in sorted({os.path.dirname(destination) for _, destination in items}):
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+
+    def copy(item: Tuple[str, str]) -> int:
+        return copy_file(item[0], item[1], link_mode)
+
+    if jobs == 1 or len(items) < 2:
+        copied = sum(map(copy, items))
+    else:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            copied = sum(pool.map(copy, items))
+    return WriteStats(len(items), copied, time.perf_counter() - start)
@@ -1,20 +1,17 @@
 import datetime
 import itertools
 import os
+import shutil
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 import typer
-from rich.panel import Panel
-from rich.text import Text
 import importlib.metadata
-import boilergen.builder.output_selection
-from boilergen.builder.cleanup import cleanup_directory
+from boilergen.builder.writer import LinkMode
 from boilergen.cli.run_config import RunConfig
 from boilergen.core.debug_manager import DebugType
-from boilergen.core.ui import get_ui
-from boilergen.core.navigator import navigate_templates
-from boilergen.core.config_manager import ConfigManager
+
+# Everything else is imported inside the commands, so short calls like --version or config stay fast
 
 app = typer.Typer(
     help="🔍 Navigate and select templates from your directory structure",
@@ -59,11 +56,29 @@ def create(
         disable_quote_parsing: bool = typer.Option(False, "--disable-quote-parsing",
                                                    help="Disable automatic quote stripping in configs"),
         dry_run: bool = typer.Option(False, "--dry-run", help="Do not generate files, only show contents"),
+        explain: bool = typer.Option(False, "--explain", help="Show the compiled injection plan before applying it"),
+        jobs: Optional[int] = typer.Option(None, "--jobs", min=1,
+                                           help="Worker threads for template discovery, file reading and writing (1 disables threading)"),
+        stream: bool = typer.Option(False, "--stream",
+                                    help="Write files that are not injection targets as soon as they are parsed"),
+        link_mode: LinkMode = typer.Option(LinkMode.COPY, "--link-mode",
+                                           help="How files without markers are placed: copy, reflink or hardlink "
+                                                "(hardlinked files share edits with the template)"),
+        manifest: Optional[Path] = typer.Option(None, "--manifest",
+                                                help="Generate unattended from a YAML spec (templates, output, config)"),
         party_mode: bool = typer.Option(False, "--fiesta", help="🎉 Fiesta mode!"),
         debug:Optional[DebugType ]= typer.Option(None, "--debug", help="Debug mode (tags, injections, all)"),
         debug_output : Optional[str] = typer.Option(None, "--debug-output", help="Debug output file path")
 ):
     """🚀 Create a new project by selecting templates interactively."""
+    from boilergen.builder.output_selection import ask_for_output_location
+    from boilergen.cli.manifest import Manifest, ManifestError
+    from boilergen.builder.parse_cache import ParseCache
+    from boilergen.core.catalog import TemplateCatalog
+    from boilergen.core.config_manager import ConfigManager
+    from boilergen.core.navigator import navigate_templates
+    from boilergen.core.ui import get_ui
+
     ui = get_ui(minimal_ui)
     config_mgr = ConfigManager()
     if debug_output and not debug:
@@ -84,13 +99,36 @@ def create(
             party_mode=party_mode,
             disable_quote_parsing_for_configs=disable_quote_parsing,
             dry_run=dry_run,
+            explain_injections=explain,
+            parse_cache=ParseCache.load(ParseCache.path_for(config_mgr.get_cache_dir())),
+            stream=stream,
+            link_mode=link_mode,
+            jobs=jobs,
             debug_type=debug,
             debug_output=Path(debug_output) if debug_output else None
         )
         # Re-get UI with debug_manager for error logging
         ui = get_ui(minimal_ui, run_config.debug_manager)
         
-        selected_templates = navigate_templates(str(template_dir), run_config)
+        catalog = TemplateCatalog.cached(template_dir, config_mgr.get_cache_dir(), jobs)
+
+        if manifest:
+            try:
+                spec = Manifest.from_file(manifest)
+                selected_templates = spec.select_templates(catalog.templates)
+            except ManifestError as e:
+                ui.error(str(e))
+                raise typer.Exit(1)
+            run_config.headless = True
+            run_config.config_values = spec.config
+            run_config.clear_output = run_config.clear_output or spec.clear_output
+            if not _generate_from_manifest(spec, selected_templates, run_config, str(template_dir), ui):
+                raise typer.Exit(1)
+            if run_config.debug_manager:
+                ui.display_file_content("log", run_config.debug_manager.get_full_log())
+            return
+
+        selected_templates = navigate_templates(str(template_dir), run_config, catalog)
         if not selected_templates:
             ui.warning("Operation cancelled or no templates selected.")
             return
@@ -112,7 +150,7 @@ def create(
             run_config.debug_manager.state_change("general", "Navigation finished, starting output selection.")
 
         # Start generation flow
-        boilergen.builder.output_selection.ask_for_output_location(selected_templates, run_config, str(template_dir))
+        ask_for_output_location(selected_templates, run_config, str(template_dir))
 
         if run_config.debug_manager:
             ui.print("\n")
@@ -132,9 +170,137 @@ def create(
 
 
 
+@app.command()
+def batch(
+        manifests: List[Path] = typer.Argument(..., help="Manifest files, one project each (see create --manifest)"),
+        processes: Optional[int] = typer.Option(None, "--processes", "-p", min=1,
+                                                help="Worker processes, one per core by default (1 generates in this process)"),
+        clear_output: bool = typer.Option(False, "--clear-output", help="Clear existing output directories first"),
+        disable_quote_parsing: bool = typer.Option(False, "--disable-quote-parsing",
+                                                   help="Disable automatic quote stripping in configs"),
+        link_mode: LinkMode = typer.Option(LinkMode.COPY, "--link-mode",
+                                           help="How files without markers are placed: copy, reflink or hardlink"),
+        minimal_ui: bool = typer.Option(False, "--minimal-ui", help="Basic terminal compatibility"),
+):
+    """📦 Generate one project per manifest, in parallel."""
+    import time
+    from boilergen.builder.batch import run_batch
+    from boilergen.builder.output_selection import clear_cloned_repo
+    from boilergen.builder.parse_cache import ParseCache
+    from boilergen.builder.writer import format_bytes
+    from boilergen.core.catalog import TemplateCatalog
+    from boilergen.core.config_manager import ConfigManager
+    from boilergen.core.ui import get_ui
+
+    ui = get_ui(minimal_ui)
+    config_mgr = ConfigManager()
+    template_dir = config_mgr.resolve_template_dir(str(DEFAULT_TEMPLATE_DIR), ui)
+    if not template_dir.exists() or not template_dir.is_dir():
+        ui.error(f"Template directory '{template_dir}' does not exist or is not a directory.")
+        raise typer.Exit(1)
+
+    start = time.perf_counter()
+    catalog = TemplateCatalog.cached(template_dir, config_mgr.get_cache_dir())
+    parse_cache = ParseCache.load(ParseCache.path_for(config_mgr.get_cache_dir()))
+    options = {
+        "clear_output": clear_output,
+        "disable_quote_parsing_for_configs": disable_quote_parsing,
+        "link_mode": link_mode,
+        # The projects already run in parallel, more threads per project would only compete for the same cores
+        "jobs": 1,
+    }
+
+    def report(result):
+        if result.ok:
+            ui.success(f"{result.manifest} -> {result.output}: {result.files} files, "
+                       f"{format_bytes(result.bytes_written)} in {result.seconds:.2f}s")
+        else:
+            ui.error(f"{result.manifest}: {result.error}")
+            if result.log.strip():
+                ui.print(result.log.rstrip())
+
+    results = run_batch(manifests, catalog.templates, template_dir, parse_cache, processes, options, report)
+    clear_cloned_repo(str(template_dir.parent), minimal_ui, ui)
+
+    failed = [result for result in results if not result.ok]
+    ui.print(f"Generated {len(results) - len(failed)} of {len(results)} projects in {time.perf_counter() - start:.2f}s "
+             f"({sum(result.seconds for result in results):.2f}s of project time)")
+    if failed:
+        raise typer.Exit(1)
+
+
+@app.command()
+def bench(
+        templates: int = typer.Option(20, "--templates", min=1, help="Number of synthetic templates"),
+        depth: int = typer.Option(3, "--depth", min=1, help="Length of the dependency chains"),
+        files: int = typer.Option(10, "--files", min=0, help="Files per template"),
+        tags: int = typer.Option(3, "--tags", min=0, help="Tags per file"),
+        configs: int = typer.Option(3, "--configs", min=0, help="Configs per file"),
+        injections: int = typer.Option(2, "--injections", min=0, help="Injections per dependent template"),
+        jobs: Optional[int] = typer.Option(None, "--jobs", min=1,
+                                           help="Worker threads for reading and writing (1 disables threading)"),
+        repeat: int = typer.Option(5, "--repeat", min=1, help="Timed runs, phases are reported as median and IQR"),
+        warmup: int = typer.Option(1, "--warmup", min=0, help="Untimed runs before the timed ones"),
+        save: Optional[Path] = typer.Option(None, "--save", help="Write the results as a JSON baseline to this file"),
+        compare_to: Optional[Path] = typer.Option(None, "--compare",
+                                                  help="Run the workload of this baseline and compare against it"),
+        threshold: float = typer.Option(0.10, "--threshold", min=0.0,
+                                        help="Relative median increase that counts as a regression (0.10 = 10%)"),
+        min_delta_ms: float = typer.Option(1.0, "--min-delta-ms", min=0.0,
+                                           help="Increases smaller than this are treated as noise"),
+):
+    """⏱️ Time every generation phase on a synthetic template repository."""
+    from boilergen.bench.compare import BaselineError, BenchmarkSummary, compare
+    from boilergen.bench.runner import run_repeated
+    from boilergen.bench.synthetic import SyntheticSpec
+    from boilergen.core.ui import get_ui
+
+    ui = get_ui(True)
+    spec = SyntheticSpec(templates, depth, files, tags, configs, injections)
+    baseline = None
+    if compare_to:
+        try:
+            baseline = BenchmarkSummary.load(compare_to)
+        except BaselineError as e:
+            ui.error(str(e))
+            raise typer.Exit(1)
+        if baseline.spec != spec:
+            ui.print(f"Using the workload of {compare_to}: {baseline.spec}")
+        spec = baseline.spec
+
+    results = run_repeated(spec, repeat, warmup, jobs)
+    summary = BenchmarkSummary.from_results(spec, results)
+    ui.print(f"{results[0].templates} templates, {results[0].files} files, {repeat} runs")
+
+    if baseline is None:
+        ui.print(f"{'phase':<45}{'median':>12}{'iqr':>12}")
+        for phase, stats in summary.phases.items():
+            ui.print(f"{phase:<45}{stats.median * 1000:>9.2f} ms{stats.iqr * 1000:>9.2f} ms")
+    else:
+        comparisons = compare(baseline, summary, threshold, min_delta_ms / 1000)
+        ui.print(f"{'phase':<45}{'baseline':>12}{'current':>12}{'delta':>10}")
+        for c in comparisons:
+            ui.print(f"{c.phase:<45}{c.baseline.median * 1000:>9.2f} ms{c.current.median * 1000:>9.2f} ms"
+                     f"{c.ratio:>+10.1%}{'  REGRESSION' if c.regressed else ''}")
+
+    if save:
+        summary.save(save)
+        ui.print(f"Results written to {save}")
+
+    if baseline is not None:
+        regressions = [c.phase for c in comparisons if c.regressed]
+        if regressions:
+            ui.error(f"Regressed by more than {threshold:.0%}: {', '.join(regressions)}")
+            raise typer.Exit(1)
+        ui.success("No phase regressed.")
+
+
 @app.command()
 def config():
     """📝 Display the configuration file location and content."""
+    from boilergen.core.config_manager import ConfigManager
+    from boilergen.core.ui import get_ui
+
     config_mgr = ConfigManager()
     ui = get_ui()
     config_path = config_mgr.get_config_path()
@@ -149,9 +315,17 @@ def config():
 @app.command()
 def templates(
         minimal_ui: bool = typer.Option(False, "--minimal-ui", help="Basic terminal compatibility"),
-        party_mode: bool = typer.Option(False, "--fiesta", help="🎉 Fiesta mode!")
+        party_mode: bool = typer.Option(False, "--fiesta", help="🎉 Fiesta mode!"),
+        jobs: Optional[int] = typer.Option(None, "--jobs", min=1,
+                                           help="Worker threads for template discovery (1 disables threading)")
 ):
     """🌳 Display a tree view of all available templates."""
+    from rich.panel import Panel
+    from boilergen.builder.output_selection import clear_cloned_repo
+    from boilergen.core.catalog import TemplateCatalog
+    from boilergen.core.config_manager import ConfigManager
+    from boilergen.core.ui import get_ui
+
     ui = get_ui(minimal_ui)
     config_mgr = ConfigManager()
     template_dir = config_mgr.resolve_template_dir(str(DEFAULT_TEMPLATE_DIR), ui)
@@ -163,7 +337,8 @@ def templates(
     if party_mode and not minimal_ui:
         _display_fiesta_tree(template_dir, ui)
     else:
-        tree = ui.build_directory_tree(str(template_dir), str(template_dir))
+        catalog = TemplateCatalog.cached(template_dir, config_mgr.get_cache_dir(), jobs)
+        tree = ui.build_directory_tree(str(template_dir), str(template_dir), catalog)
         if minimal_ui:
             ui.print("Template Directory Structure:\n" + "=" * 40)
             ui.print(tree)
@@ -172,7 +347,7 @@ def templates(
 
     # Cleanup cloned repo if any
     parent_dir = template_dir.parent
-    boilergen.builder.output_selection.clear_cloned_repo(str(parent_dir), minimal_ui, ui)
+    clear_cloned_repo(str(parent_dir), minimal_ui, ui)
 
 
 @app.command()
@@ -181,6 +356,9 @@ def cleanup(
     minimal_ui: bool = typer.Option(False, "--minimal-ui", help="Basic terminal compatibility"),
 ):
     """🧹 Clean up files by removing multiple consecutive empty lines and trimming leading/trailing ones."""
+    from boilergen.builder.cleanup import cleanup_directory
+    from boilergen.core.ui import get_ui
+
     ui = get_ui(minimal_ui)
     
     if not path.exists():
@@ -192,7 +370,30 @@ def cleanup(
     ui.success("Cleanup complete.")
 
 
+def _generate_from_manifest(spec, selected_templates, run_config: RunConfig, template_dir: str, ui) -> bool:
+    from boilergen.builder.output_selection import clear_cloned_repo, generate_project, prepare_output_directory
+
+    created = not spec.output.exists()
+    # The manifest asked for clear_output itself, there is nobody to confirm it
+    if not prepare_output_directory(spec.output, run_config, ui, confirm=False):
+        return False
+    try:
+        generate_project(spec.output, selected_templates, run_config, template_dir)
+    except ValueError as e:
+        # Configs without a default need a value in the manifest, there is no editor to ask for it
+        ui.error(str(e))
+        if created and spec.output.exists():
+            shutil.rmtree(spec.output, ignore_errors=True)
+        return False
+    finally:
+        clear_cloned_repo(str(Path(template_dir).parent), run_config.minimal_ui, ui)
+    return True
+
+
 def _display_fiesta_tree(path: Path, ui):
+    from rich.panel import Panel
+    from rich.text import Text
+
     tree_text = generate_simple_tree_text(str(path))
     rainbow_text = Text()
     color_cycle = itertools.cycle(RAINBOW_COLORS)
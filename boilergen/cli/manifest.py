@@ -0,0 +1,72 @@
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from boilergen.core.template import Template
+from boilergen.core.template_finder import resolve_dependencies
+from boilergen.core.yaml_loader import YAMLError, load_yaml_file
+
+
+class ManifestError(ValueError):
+    """Raised for manifests that cannot drive a generation run."""
+
+
+class Manifest:
+    """
+    Spec for an unattended `create` run.
+
+    ```yaml
+    templates: [flask-api, supabase]   # template ids, dependencies are added automatically
+    output: ./services/orders          # relative paths are resolved against the manifest's directory
+    clear_output: false                # optional, replace an existing output directory
+    config:                            # optional, values for boilergen:config identifiers
+      port: 8080
+    ```
+    """
+
+    def __init__(self, templates: List[str], output: Path, config: Optional[Dict[str, Any]] = None,
+                 clear_output: bool = False):
+        self.templates = templates
+        self.output = output
+        self.config = config or {}
+        self.clear_output = clear_output
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path]) -> 'Manifest':
+        path = Path(path)
+        try:
+            data = load_yaml_file(path)
+        except (OSError, YAMLError) as e:
+            raise ManifestError(f"Cannot read manifest {path}: {e}") from e
+        return cls.from_dict(data, path.parent)
+
+    @classmethod
+    def from_dict(cls, data: Any, base_dir: Union[str, Path] = ".") -> 'Manifest':
+        if not isinstance(data, dict):
+            raise ManifestError("The manifest must be a mapping")
+
+        templates = data.get("templates")
+        if isinstance(templates, str):
+            templates = [templates]
+        if not templates or not isinstance(templates, list) or not all(isinstance(t, str) for t in templates):
+            raise ManifestError("'templates' must list at least one template id")
+
+        output = data.get("output")
+        if not output or not isinstance(output, str):
+            raise ManifestError("'output' must be the path of the output directory")
+
+        config = data.get("config") or {}
+        if not isinstance(config, dict):
+            raise ManifestError("'config' must map config identifiers to values")
+
+        output_path = Path(output).expanduser()
+        if not output_path.is_absolute():
+            output_path = Path(base_dir) / output_path
+        return cls(templates, output_path, config, bool(data.get("clear_output", False)))
+
+    def select_templates(self, all_templates: Dict[str, Template]) -> List[Template]:
+        """The requested templates and their dependencies, as navigation would have selected them."""
+        unknown = [tid for tid in self.templates if tid not in all_templates]
+        if unknown:
+            raise ManifestError(f"Unknown template id(s): {', '.join(unknown)}")
+        required_ids, _ = resolve_dependencies(self.templates, all_templates)
+        return [all_templates[tid] for tid in required_ids if tid in all_templates]
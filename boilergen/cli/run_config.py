@@ -1,7 +1,9 @@
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
 
+from boilergen.builder.parse_cache import ParseCache
+from boilergen.builder.writer import LinkMode
 from boilergen.core.debug_manager import DebugType, get_debug_manager, DebugManager
 
 
@@ -13,6 +15,13 @@ class RunConfig:
     party_mode: bool = False
     disable_quote_parsing_for_configs : bool = False
     dry_run: bool = False
+    explain_injections: bool = False
+    parse_cache: Optional[ParseCache] = None
+    stream: bool = False
+    link_mode: LinkMode = LinkMode.COPY
+    headless: bool = False  # no prompts, clears or editors, configs come from config_values
+    config_values: Dict[str, Any] = field(default_factory=dict)
+    jobs: Optional[int] = None  # worker threads for I/O heavy phases, None picks a default and 1 disables threading
     debug_type : Optional[DebugType] = None
     debug_output : Optional[Path] = None
     debug_manager : Optional[DebugManager] = field(default=None, init=False)
@@ -0,0 +1,209 @@
+import hashlib
+import os
+import marshal
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .template import Template
+from .template_finder import list_child_directories, split_templates
+
+
+class CatalogIndex:
+    """
+    Persistent snapshot of a template tree stored in the user cache dir.
+
+    Directory listings are revalidated by the directory mtime and parsed template.yaml files by their mtime and
+    size, so a warm start only stats the tree and reparses templates that actually changed.
+    """
+
+    VERSION = 2
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path
+        # directory -> (mtime_ns, child directory names)
+        self.directories: Dict[str, Tuple[int, List[str]]] = {}
+        # template directory -> (mtime_ns, size, (id, label, requires, config) or None if unparsable)
+        self.templates: Dict[str, Tuple[int, int, Optional[Tuple[str, str, List[str], Dict[str, Any]]]]] = {}
+        self.dirty = False
+        self.reparsed = 0
+        self._seen = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def path_for(cache_dir: Union[str, Path], base_path: Union[str, Path]) -> Path:
+        digest = hashlib.sha1(os.path.abspath(str(base_path)).encode("utf-8")).hexdigest()[:16]
+        return Path(cache_dir) / f"catalog-{digest}.bin"
+
+    @classmethod
+    def load(cls, path: Path) -> 'CatalogIndex':
+        """Load the index at path, starting empty if it is missing, unreadable or from another version."""
+        index = cls(path)
+        try:
+            with open(path, "rb") as f:
+                version, directories, templates = marshal.load(f)
+            if version == cls.VERSION and isinstance(directories, dict) and isinstance(templates, dict):
+                index.directories = directories
+                index.templates = templates
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+        return index
+
+    def save(self):
+        """Write the index if anything changed, replacing the old file atomically."""
+        # Forget directories and templates that were not reached by the last scan
+        for entries in (self.directories, self.templates):
+            for stale in [key for key in entries if key not in self._seen]:
+                del entries[stale]
+                self.dirty = True
+        if not self.dirty or self.path is None:
+            return
+        data = (self.VERSION, self.directories, self.templates)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "wb") as f:
+                marshal.dump(data, f)
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+        except OSError:
+            # The index is only an accelerator, a read-only cache dir must not break template discovery
+            pass
+
+    def list_children(self, path: str) -> List[str]:
+        """Child directory names of path, served from the index while the directory mtime is unchanged."""
+        key = os.path.abspath(path)
+        try:
+            mtime = os.stat(key).st_mtime_ns
+        except OSError:
+            return []
+
+        with self._lock:
+            self._seen.add(key)
+            entry = self.directories.get(key)
+        if entry is not None and entry[0] == mtime:
+            return entry[1]
+        children = list_child_directories(key)
+        with self._lock:
+            self.directories[key] = (mtime, children)
+            self.dirty = True
+        return children
+
+    def load_template(self, template_path: str, stat: os.stat_result) -> Optional[Template]:
+        """Template of template_path, only reparsed if its template.yaml changed."""
+        key = os.path.abspath(template_path)
+        with self._lock:
+            self._seen.add(key)
+            entry = self.templates.get(key)
+        if entry is None or entry[0] != stat.st_mtime_ns or entry[1] != stat.st_size:
+            template = Template.from_yaml_file(template_path)
+            fields = (template.id, template.label, template.requires, template.config) if template else None
+            entry = (stat.st_mtime_ns, stat.st_size, fields)
+            try:
+                marshal.dumps(fields)
+            except ValueError:
+                # YAML values such as dates cannot be stored, the template is reparsed on every run instead
+                with self._lock:
+                    if self.templates.pop(key, None) is not None:
+                        self.dirty = True
+                    self.reparsed += 1
+                return template
+            with self._lock:
+                self.templates[key] = entry
+                self.dirty = True
+                self.reparsed += 1
+
+        if entry[2] is None:
+            return None
+        template_id, label, requires, config = entry[2]
+        template = Template(template_id, label, list(requires), config)
+        template.path = template_path
+        return template
+
+
+class TemplateCatalog:
+    """
+    In-memory snapshot of a template directory.
+
+    The directory tree is scanned and every template.yaml parsed exactly once. Navigation, tree rendering and
+    generation then work on the snapshot instead of going back to disk, which matters on slow or network mounts.
+    """
+
+    def __init__(self, base_path: Union[str, Path], index: Optional[CatalogIndex] = None, jobs: Optional[int] = None):
+        self.base_path = Path(base_path)
+        self.index = index
+        self.templates: Dict[str, Template] = {}
+        self._directories: Dict[str, Tuple[List[str], List[Template]]] = {}
+        self._scan(jobs)
+        if index is not None:
+            index.save()
+
+    @classmethod
+    def cached(cls, base_path: Union[str, Path], cache_dir: Union[str, Path],
+               jobs: Optional[int] = None) -> 'TemplateCatalog':
+        """Build the catalog through the persistent index kept in cache_dir."""
+        return cls(base_path, CatalogIndex.load(CatalogIndex.path_for(cache_dir, base_path)), jobs)
+
+    @staticmethod
+    def _key(path: Union[str, Path]) -> str:
+        return os.path.normcase(os.path.normpath(str(path)))
+
+    def _list_level(self, path: str) -> Tuple[List[str], List[Tuple[str, os.stat_result]]]:
+        children = self.index.list_children(path) if self.index is not None else list_child_directories(path)
+        return split_templates(path, children)
+
+    def _load_template(self, item: Tuple[str, os.stat_result]) -> Optional[Template]:
+        template_path, marker_stat = item
+        if self.index is not None:
+            return self.index.load_template(template_path, marker_stat)
+        return Template.from_yaml_file(template_path)
+
+    def _scan(self, jobs: Optional[int]):
+        """
+        Discover the tree breadth first and parse the found templates.
+
+        Every stat and every YAML parse is a round trip on network mounts, so the directories of one level and
+        all template manifests are handled by a thread pool. jobs=1 keeps everything on the calling thread.
+        """
+        pool = ThreadPoolExecutor(max_workers=jobs) if jobs != 1 else None
+        mapper = pool.map if pool is not None else map
+        try:
+            listings: Dict[str, Tuple[List[str], List[Tuple[str, os.stat_result]]]] = {}
+            level = [str(self.base_path)]
+            while level:
+                next_level = []
+                for path, (subgroups, template_dirs) in zip(level, mapper(self._list_level, level)):
+                    listings[path] = (subgroups, template_dirs)
+                    next_level.extend(os.path.join(path, subgroup) for subgroup in subgroups)
+                level = next_level
+
+            template_dirs = [item for _, items in listings.values() for item in items]
+            loaded = dict(zip((d for d, _ in template_dirs), mapper(self._load_template, template_dirs)))
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        for path, (subgroups, items) in listings.items():
+            templates = [loaded[d] for d, _ in items if loaded[d]]
+            self._directories[self._key(path)] = (sorted(subgroups), sorted(templates, key=lambda t: t.label))
+        self._collect(str(self.base_path))
+
+    def _collect(self, path: str):
+        # Same depth first order as the old recursive scan, so later templates with a duplicate id still win
+        subgroups, templates = self._directories[self._key(path)]
+        for template in templates:
+            self.templates[template.id] = template
+        for subgroup in subgroups:
+            self._collect(os.path.join(path, subgroup))
+
+    def list(self, path: Union[str, Path]) -> Tuple[List[str], List[Template]]:
+        """Subgroups and templates directly inside path, sorted like list_subgroups_and_templates."""
+        subgroups, templates = self._directories.get(self._key(path), ([], []))
+        return list(subgroups), list(templates)
+
+    def get(self, template_id: str) -> Optional[Template]:
+        return self.templates.get(template_id)
+
+    def __len__(self):
+        return len(self.templates)
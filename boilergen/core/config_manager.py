@@ -4,7 +4,6 @@ import appdirs
 import shutil
 from pathlib import Path
 from typing import Tuple, Optional
-from git import Repo, InvalidGitRepositoryError
 
 class ConfigManager:
     """Handles project configuration and template directory resolution."""
@@ -13,6 +12,7 @@ class ConfigManager:
         self.app_name = app_name
         self.config_dir = Path(appdirs.user_config_dir(app_name))
         self.config_file = self.config_dir / "boilergen.config"
+        self.cache_dir = Path(appdirs.user_cache_dir(app_name))
         self.config = configparser.ConfigParser()
         self._ensure_config_exists()
         self.config.read(str(self.config_file))
@@ -39,6 +39,8 @@ class ConfigManager:
         repository_url = self.config["TEMPLATES"].get("TemplateRepository", "")
 
         if not template_dir_str and repository_url:
+            # GitPython is slow to import and only needed for remote templates
+            from git import Repo, InvalidGitRepositoryError
             if ui: ui.warning("Cloning templates from repository...")
             
             local_clone_path = Path.cwd() / "cloned_templates"
@@ -60,3 +62,7 @@ class ConfigManager:
 
     def get_config_path(self) -> Path:
         return self.config_file
+
+    def get_cache_dir(self) -> Path:
+        """Directory for rebuildable caches such as the template catalog index."""
+        return self.cache_dir
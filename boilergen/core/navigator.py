@@ -1,9 +1,8 @@
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple, Any
 import questionary
+from .catalog import TemplateCatalog
 from .template_finder import (
-    list_subgroups_and_templates,
-    find_all_templates,
     resolve_dependencies,
     find_dependents
 )
@@ -14,7 +13,7 @@ from .ui import UI, get_ui
 class NavigationController:
     """Controls the template selection navigation flow."""
     
-    def __init__(self, base_path: Path, run_config, ui: UI):
+    def __init__(self, base_path: Path, run_config, ui: UI, catalog: Optional[TemplateCatalog] = None):
         self.base_path = base_path
         self.run_config = run_config
         self.ui = ui
@@ -22,7 +21,8 @@ class NavigationController:
         self.selected_ids = []
         self.excluded_ids = []  # Templates explicitly excluded in expert mode
         self.history = []
-        self.all_templates = find_all_templates(str(base_path))
+        self.catalog = catalog if catalog is not None else TemplateCatalog(base_path)
+        self.all_templates = self.catalog.templates
 
     def _get_breadcrumb(self) -> str:
         """Generate a breadcrumb-style path display."""
@@ -52,7 +52,7 @@ class NavigationController:
             self.ui.display_current_selection(current_selection, auto_ids, self.all_templates, self.run_config.disable_dependencies)
             self.ui.print("")
 
-            subgroups, templates = list_subgroups_and_templates(str(self.current_path))
+            subgroups, templates = self.catalog.list(self.current_path)
             choices = self._build_choices(templates, subgroups, auto_ids, current_selection)
 
             if not choices or (len(choices) == 1 and choices[0].value[0] == "finish"):
@@ -161,8 +161,8 @@ def find_all_dependents_recursive(template_id: str, all_templates: Dict[str, Tem
     return list(all_deps)
 
 
-def navigate_templates(base_path: str, run_config) -> List[Template]:
+def navigate_templates(base_path: str, run_config, catalog: Optional[TemplateCatalog] = None) -> List[Template]:
     """Legacy wrapper for NavigationController."""
     ui = get_ui(run_config.minimal_ui)
-    controller = NavigationController(Path(base_path), run_config, ui)
+    controller = NavigationController(Path(base_path), run_config, ui, catalog)
     return controller.navigate()
@@ -1,7 +1,8 @@
-import yaml
 import os
 from typing import Dict, List, Any, Optional
 
+from .yaml_loader import YAMLError, load_yaml_file
+
 
 class Template:
     def __init__(self, id: str, label: str, requires: List[str] = None, config: Dict[str, Any] = None):
@@ -20,8 +21,7 @@ class Template:
             return None
 
         try:
-            with open(yaml_path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
+            data = load_yaml_file(yaml_path)
 
             template = cls(
                 id=data.get('id', ''),
@@ -31,7 +31,7 @@ class Template:
             )
             template.path = template_path
             return template
-        except (yaml.YAMLError, KeyError, FileNotFoundError) as e:
+        except (YAMLError, KeyError, FileNotFoundError) as e:
             print(f"Error loading template from {yaml_path}: {e}")
             return None
 
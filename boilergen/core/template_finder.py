@@ -1,36 +1,40 @@
-from pathlib import Path
+import os
 from typing import List, Tuple, Dict, Optional
 from .template import Template
 
 TEMPLATE_MARKER = "template.yaml"
 
+def list_child_directories(path: str) -> List[str]:
+    """Names of the subdirectories of path, using the file type scandir already reports."""
+    try:
+        with os.scandir(path) as it:
+            return [entry.name for entry in it if entry.is_dir()]
+    except OSError:
+        return []
+
+def split_templates(path: str, children: List[str]) -> Tuple[List[str], List[Tuple[str, os.stat_result]]]:
+    """Split child directories into subgroups and template directories, the latter with the stat of their marker."""
+    subgroups, template_dirs = [], []
+    for name in children:
+        child = os.path.join(path, name)
+        try:
+            marker_stat = os.stat(os.path.join(child, TEMPLATE_MARKER))
+        except OSError:
+            subgroups.append(name)
+            continue
+        template_dirs.append((child, marker_stat))
+    return subgroups, template_dirs
+
 def list_subgroups_and_templates(path: str) -> Tuple[List[str], List[Template]]:
     """List subdirectories and templates in the given path."""
-    subgroups, templates = [], []
-    p = Path(path)
-    if not p.exists(): return [], []
-    
-    for entry in p.iterdir():
-        if entry.is_dir():
-            marker = entry / TEMPLATE_MARKER
-            if marker.exists():
-                template = Template.from_yaml_file(str(entry))
-                if template: templates.append(template)
-            else:
-                subgroups.append(entry.name)
-                
+    subgroups, template_dirs = split_templates(path, list_child_directories(path))
+    templates = [t for t in (Template.from_yaml_file(d) for d, _ in template_dirs) if t]
     return sorted(subgroups), sorted(templates, key=lambda t: t.label)
 
 def find_all_templates(base_path: str) -> Dict[str, Template]:
     """Recursively find all templates in the directory structure."""
-    templates = {}
-    def scan_directory(path: Path):
-        subgroups, path_templates = list_subgroups_and_templates(str(path))
-        for t in path_templates: templates[t.id] = t
-        for s in subgroups: scan_directory(path / s)
-        
-    scan_directory(Path(base_path))
-    return templates
+    from .catalog import TemplateCatalog
+    return dict(TemplateCatalog(base_path).templates)
 
 def resolve_dependencies(selected_ids: List[str], all_templates: Dict[str, Template]) -> Tuple[List[str], List[str]]:
     """Resolve template dependencies and return all required IDs and auto-selected IDs."""
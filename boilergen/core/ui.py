@@ -1,7 +1,6 @@
 import os
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional, Union
-import questionary
 from rich.console import Console
 from rich.panel import Panel
 from rich.tree import Tree
@@ -29,7 +28,7 @@ class UI(ABC):
         pass
     
     @abstractmethod
-    def build_directory_tree(self, template_dir: str, base_path: str) -> Any:
+    def build_directory_tree(self, template_dir: str, base_path: str, catalog=None) -> Any:
         pass
 
     @abstractmethod
@@ -92,6 +91,7 @@ class RichUI(UI):
         self.console.print(Panel(syntax, title=f"📄 {title}", border_style="blue", padding=(1, 2)))
 
     def prompt(self, message: str, default: str = "") -> str:
+        import questionary
         return questionary.text(message, default=default).ask()
 
     def display_current_selection(self, selected_templates: List[Template], auto_selected_ids: List[str], 
@@ -183,11 +183,13 @@ class RichUI(UI):
             groups.setdefault(dir_path, []).append(template)
         return groups
 
-    def build_directory_tree(self, template_dir: str, base_path: str) -> Tree:
-        from .template_finder import list_subgroups_and_templates
+    def build_directory_tree(self, template_dir: str, base_path: str, catalog=None) -> Tree:
+        from .catalog import TemplateCatalog
+        if catalog is None:
+            catalog = TemplateCatalog(base_path)
         
         def _build(path: str, tree_node: Tree):
-            subgroups, templates = list_subgroups_and_templates(path)
+            subgroups, templates = catalog.list(path)
             for template in templates:
                 tree_node.add(f"📄 {template.label} ({template.id})")
             for subgroup in subgroups:
@@ -199,6 +201,7 @@ class RichUI(UI):
         return tree_root
 
     def select(self, message: str, choices: List[Any], use_shortcuts: bool = True, style: Optional[Any] = None) -> Any:
+        import questionary
         if style is None:
             style = questionary.Style([
                 ('selected', 'fg:#ffffff bg:#0066cc bold'),
@@ -210,9 +213,11 @@ class RichUI(UI):
         return questionary.select(message, choices=choices, style=style, use_shortcuts=use_shortcuts).ask()
 
     def confirm(self, message: str, default: bool = False) -> bool:
+        import questionary
         return questionary.confirm(message, default=default).ask()
 
     def press_any_key(self, message: str = "Press any key to continue..."):
+        import questionary
         questionary.press_any_key_to_continue(message).ask()
 
     def print(self, message: str, style: Optional[str] = None):
@@ -291,12 +296,14 @@ class MinimalUI(UI):
         print("=" * 50)
         print("From here on you will exit --minimal-ui mode")
 
-    def build_directory_tree(self, template_dir: str, base_path: str) -> str:
-        from .template_finder import list_subgroups_and_templates
+    def build_directory_tree(self, template_dir: str, base_path: str, catalog=None) -> str:
+        from .catalog import TemplateCatalog
+        if catalog is None:
+            catalog = TemplateCatalog(base_path)
         lines = [f"{os.path.basename(template_dir)}/"]
 
         def _build(path: str, prefix: str = ""):
-            subgroups, templates = list_subgroups_and_templates(path)
+            subgroups, templates = catalog.list(path)
             for i, template in enumerate(templates):
                 is_last = (i == len(templates) - 1) and not subgroups
                 connector = "+-- " if is_last else "|-- "
@@ -311,9 +318,11 @@ class MinimalUI(UI):
         return "\n".join(lines)
 
     def select(self, message: str, choices: List[Any], use_shortcuts: bool = True, style: Optional[Any] = None) -> Any:
+        import questionary
         return questionary.select(message, choices=choices, use_shortcuts=use_shortcuts).ask()
 
     def confirm(self, message: str, default: bool = False) -> bool:
+        import questionary
         return questionary.confirm(message, default=default).ask()
 
     def press_any_key(self, message: str = "Press any key to continue..."):
@@ -0,0 +1,21 @@
+from typing import Any
+
+import yaml
+
+try:
+    # libyaml bindings are several times faster than the pure Python loader
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+YAMLError = yaml.YAMLError
+
+
+def load_yaml(stream) -> Any:
+    """Parse a YAML string or stream like yaml.safe_load does."""
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def load_yaml_file(path) -> Any:
+    with open(path, "r", encoding="utf-8") as f:
+        return load_yaml(f)
@@ -0,0 +1,36 @@
+import pytest
+
+
+def write_template(base, name, requires=(), files=None, injections=None):
+    """
+    Write a template called name below base and return its directory.
+
+    files maps paths inside template/ to their content (str or bytes), injections maps file names inside
+    injections;/ to theirs.
+    """
+    template_dir = base / name
+    (template_dir / "template").mkdir(parents=True)
+    (template_dir / "template.yaml").write_text(f"id: {name}\nlabel: {name}\nrequires: {list(requires)}\n")
+    for directory, contents in (("template", files), ("injections;", injections)):
+        for rel, content in (contents or {}).items():
+            path = template_dir / directory / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if isinstance(content, bytes):
+                path.write_bytes(content)
+            else:
+                path.write_text(content)
+    return template_dir
+
+
+@pytest.fixture
+def make_template():
+    return write_template
+
+
+@pytest.fixture
+def templates_dir(tmp_path):
+    """boilergen/templates below tmp_path with `base` and `api`, which requires base and has a `port` config."""
+    templates = tmp_path / "boilergen" / "templates"
+    write_template(templates, "base", files={"base.py": "base\n"})
+    write_template(templates, "api", requires=["base"], files={"api.py": "port = boilergen:config | port | 80\n"})
+    return templates
@@ -0,0 +1,65 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from boilergen.api import GenerationError, GenerationOptions, generate
+from boilergen.builder.parse_cache import ParseCache
+from boilergen.core.catalog import TemplateCatalog
+
+
+@pytest.fixture
+def catalog(templates_dir):
+    hooks_dir = templates_dir.parent / "hooks"
+    hooks_dir.mkdir()
+    (hooks_dir / "post-generation.txt").write_text("echo done > hook.txt\n")
+    return TemplateCatalog(str(templates_dir))
+
+
+def test_generate_writes_files_and_reports_timings(tmp_path, catalog):
+    cwd = os.getcwd()
+    result = generate(["api"], tmp_path / "out", {"port": 8080}, GenerationOptions(catalog=catalog, jobs=1))
+
+    out = tmp_path / "out"
+    assert sorted(result.files) == [str(out / "api.py"), str(out / "base.py")]
+    assert (out / "api.py").read_text().strip() == "port = 8080"
+    assert result.stats.files == 2
+    assert {"select", "prepare", "injections", "render", "write", "hooks"} <= set(result.timings)
+    # Hooks run inside the output directory without moving the caller
+    assert (out / "hook.txt").read_text().strip() == "done"
+    assert os.getcwd() == cwd
+
+    with pytest.raises(FileExistsError):
+        generate(["api"], out, options=GenerationOptions(catalog=catalog))
+    result = generate(["api"], out, options=GenerationOptions(catalog=catalog, clear_output=True, run_hooks=False))
+    assert (out / "api.py").read_text().strip() == "port = 80"
+    assert not (out / "hook.txt").exists()
+
+    with pytest.raises(GenerationError, match="missing"):
+        generate(["missing"], tmp_path / "other", options=GenerationOptions(catalog=catalog))
+
+
+def test_generate_from_threads(tmp_path, catalog):
+    options = GenerationOptions(catalog=catalog, parse_cache=ParseCache(), run_hooks=False)
+
+    def run(port):
+        return generate(["api"], tmp_path / "out" / str(port), {"port": port}, options)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(run, range(8000, 8008)))
+
+    for port, result in zip(range(8000, 8008), results):
+        assert len(result.files) == 2
+        assert (tmp_path / "out" / str(port) / "api.py").read_text().strip() == f"port = {port}"
+
+
+def test_generate_failure_raises_generation_error_and_removes_output(tmp_path, templates_dir, make_template):
+    make_template(templates_dir, "secret", files={"secret.py": "SECRET = boilergen:config | secret\n"})
+    options = GenerationOptions(catalog=TemplateCatalog(str(templates_dir)), run_hooks=False)
+
+    with pytest.raises(GenerationError, match="secret"):
+        generate(["base", "secret"], tmp_path / "out", options=options)
+    assert not (tmp_path / "out").exists()
+
+    result = generate(["base", "secret"], tmp_path / "out", {"secret": "s3"}, options)
+    assert (tmp_path / "out" / "secret.py").read_text().strip() == "SECRET = s3"
+    assert len(result.files) == 2
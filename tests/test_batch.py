@@ -0,0 +1,50 @@
+import pytest
+from boilergen.builder.batch import run_batch, warm_parse_cache
+from boilergen.builder.parse_cache import ParseCache
+from boilergen.core.catalog import TemplateCatalog
+
+
+@pytest.fixture
+def batch_setup(tmp_path, templates_dir):
+    manifests = []
+    for port in (8001, 8002, 8003):
+        path = tmp_path / f"project-{port}.yaml"
+        path.write_text(f"templates: [api]\noutput: out/{port}\nconfig:\n  port: {port}\n")
+        manifests.append(path)
+    (tmp_path / "broken.yaml").write_text("templates: [missing]\noutput: out/broken\n")
+    manifests.append(tmp_path / "broken.yaml")
+    return tmp_path, templates_dir, manifests
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_run_batch_generates_every_manifest(batch_setup, processes):
+    tmp_path, templates_dir, manifests = batch_setup
+    catalog = TemplateCatalog(str(templates_dir))
+    cache = ParseCache.load(ParseCache.path_for(tmp_path / "cache"))
+
+    finished = []
+    results = run_batch(manifests, catalog.templates, templates_dir, cache, processes, {"jobs": 1}, finished.append)
+
+    assert [r.manifest for r in results] == [str(m) for m in manifests]
+    assert sorted(r.manifest for r in finished) == sorted(r.manifest for r in results)
+    assert [r.ok for r in results] == [True, True, True, False]
+    assert "missing" in results[-1].error
+    for port, result in zip((8001, 8002, 8003), results):
+        assert result.files == 2
+        assert (tmp_path / "out" / str(port) / "api.py").read_text().strip() == f"port = {port}"
+        assert (tmp_path / "out" / str(port) / "base.py").read_text() == "base\n"
+    # The cache was warmed and saved once for the whole batch
+    assert len(ParseCache.load(ParseCache.path_for(tmp_path / "cache"))) == 1
+
+    # Existing output directories are reported as failures, not overwritten
+    again = run_batch(manifests[:1], catalog.templates, templates_dir, cache, processes)
+    assert not again[0].ok and "already exists" in again[0].error
+
+
+def test_warm_parse_cache_parses_each_file_once(batch_setup):
+    _, templates_dir, _ = batch_setup
+    catalog = TemplateCatalog(str(templates_dir))
+    cache = ParseCache()
+
+    assert warm_parse_cache(list(catalog.templates.values()), cache) == 1
+    assert warm_parse_cache(list(catalog.templates.values()), cache) == 0
@@ -0,0 +1,91 @@
+import json
+
+import pytest
+from boilergen.bench.compare import BaselineError, BenchmarkSummary, PhaseStats, compare
+from boilergen.bench.runner import PHASES, run_pipeline, run_repeated, run_synthetic
+from boilergen.bench.synthetic import SyntheticSpec, generate_template_tree
+from boilergen.core.template_finder import find_all_templates
+
+
+def test_generate_template_tree_follows_spec(tmp_path):
+    spec = SyntheticSpec(templates=7, depth=3, files=4, tags=2, configs=3, injections=2)
+    templates_dir = generate_template_tree(tmp_path, spec)
+
+    templates = find_all_templates(str(templates_dir))
+    assert len(templates) == 7
+    assert templates["t000"].requires == []
+    assert templates["t001"].requires == ["t000"]
+    assert templates["t003"].requires == []
+    assert templates["t001"].config == {"t001_c0": "yaml_1"}
+    assert len(list((templates_dir / "group0" / "t001" / "template").rglob("*.py"))) == 4
+    assert len(list((templates_dir / "group0" / "t001" / "injections;").glob("inject_*.py"))) == 2
+    assert not (templates_dir / "group0" / "t000" / "injections;").exists()
+
+
+def test_run_pipeline_times_every_phase(tmp_path):
+    spec = SyntheticSpec(templates=4, depth=2, files=3, tags=2, configs=2, injections=1)
+    templates_dir = generate_template_tree(tmp_path, spec)
+
+    result = run_pipeline(templates_dir, tmp_path / "output", jobs=1)
+
+    assert list(result.timings) == PHASES
+    assert all(seconds >= 0 for seconds in result.timings.values())
+    assert (result.templates, result.files) == (4, 12)
+    module = (tmp_path / "output" / "t000" / "module_0.py").read_text()
+    # Injected by t001, configs resolved from template.yaml and the defaults, tags removed
+    assert "injected_t001_0 = True" in module
+    assert 'value_0 = yaml_0' in module and 'value_1 = "default_1"' in module
+    assert "boilergen" not in module
+
+
+def test_run_synthetic_emits_json():
+    spec = SyntheticSpec(templates=2, files=2)
+    data = json.loads(run_synthetic(spec, jobs=1).to_json())
+
+    assert data["workload"] == spec.to_dict()
+    assert list(data["phases"]) == PHASES
+    assert data["files"] == 4
+    assert abs(data["total"] - sum(data["phases"].values())) < 1e-9
+
+
+def test_phase_stats_median_and_iqr():
+    stats = PhaseStats([0.5, 0.1, 0.2, 0.3, 0.4])
+    assert stats.median == 0.3
+    assert stats.iqr == pytest.approx(0.2)
+    assert PhaseStats([0.2]).iqr == 0.0
+
+
+def test_compare_flags_regressions_beyond_threshold_and_noise():
+    spec = SyntheticSpec()
+    baseline = BenchmarkSummary(spec, {"write": PhaseStats([0.100, 0.101, 0.102]),
+                                       "noisy": PhaseStats([0.05, 0.10, 0.15]),
+                                       "tiny": PhaseStats([0.0001] * 3)})
+    current = BenchmarkSummary(spec, {"write": PhaseStats([0.130, 0.131, 0.132]),
+                                      "noisy": PhaseStats([0.08, 0.13, 0.18]),
+                                      "tiny": PhaseStats([0.0003] * 3)})
+
+    result = {c.phase: c for c in compare(baseline, current, threshold=0.10, min_delta=0.001)}
+
+    assert result["write"].regressed and result["write"].ratio == pytest.approx(0.297, abs=0.001)
+    # 30% slower, but well inside the spread of the samples
+    assert not result["noisy"].regressed
+    # Tripled, but by a fraction of a millisecond
+    assert not result["tiny"].regressed
+    assert not compare(baseline, current, threshold=0.5)[0].regressed
+
+
+def test_baseline_round_trip(tmp_path):
+    spec = SyntheticSpec(templates=2, files=1)
+    results = run_repeated(spec, repeat=3, warmup=0, jobs=1)
+    summary = BenchmarkSummary.from_results(spec, results)
+    summary.save(tmp_path / "baseline.json")
+
+    loaded = BenchmarkSummary.load(tmp_path / "baseline.json")
+    assert loaded.spec == spec
+    assert list(loaded.phases) == PHASES + ["total"]
+    assert loaded.phases["write"].samples == [r.timings["write"] for r in results]
+    assert not any(c.regressed for c in compare(loaded, loaded))
+
+    (tmp_path / "broken.json").write_text('{"version": 99}')
+    with pytest.raises(BaselineError):
+        BenchmarkSummary.load(tmp_path / "broken.json")
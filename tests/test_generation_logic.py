@@ -0,0 +1,57 @@
+import pytest
+from boilergen.builder.edit_buffer import EditBuffer
+from boilergen.builder.generation_logic import generate_file_content_data
+from boilergen.builder.parser.configs import extract_configs
+from boilergen.builder.parser.tags import TemplateFile, pair_tags
+from boilergen.builder.parser.tokenizer import tokenize
+from boilergen.cli.run_config import RunConfig
+
+
+def make_template_file(content: str) -> TemplateFile:
+    tokens = tokenize(content)
+    return TemplateFile(content, pair_tags(tokens)[0], extract_configs(content, tokens=tokens), "dest",
+                        tokens=tokens)
+
+
+def test_edit_buffer_applies_edits_in_any_order():
+    buffer = EditBuffer("a = 1\nb = 2\nc = 3")
+    buffer.replace(16, 17, "30")
+    buffer.replace(4, 5, "10")
+    buffer.clear_line(2)
+
+    assert buffer.render() == "a = 10\n\nc = 30"
+
+
+def test_edit_buffer_keeps_cleared_last_line():
+    buffer = EditBuffer("a\n# tag")
+    buffer.clear_line(2)
+
+    assert buffer.render_lines() == ["a", ""]
+
+
+def test_generate_substitutes_configs_and_removes_tags():
+    tf = make_template_file(
+        "# <<boilergen:main\n"
+        "app.run(host='boilergen:config | IP | \"0.0.0.0\"', port=\"boilergen:config | port | 5000\")\n"
+        "# boilergen:main>>"
+    )
+    tf.configs[1].cli_value = "8080"
+
+    generate_file_content_data(tf, RunConfig())
+
+    assert tf.content == "\napp.run(host=\"0.0.0.0\", port=8080)\n"
+
+
+def test_generate_keeps_quotes_when_quote_parsing_disabled():
+    tf = make_template_file("port = 'boilergen:config | port | 5000'")
+
+    generate_file_content_data(tf, RunConfig(disable_quote_parsing_for_configs=True))
+
+    assert tf.content == "port = '5000'"
+
+
+def test_generate_rejects_undefined_config():
+    tf = make_template_file("port = 'boilergen:config | port'")
+
+    with pytest.raises(ValueError, match="Missing config value"):
+        generate_file_content_data(tf, RunConfig())
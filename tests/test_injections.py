@@ -0,0 +1,168 @@
+import os
+import pytest
+from boilergen.builder.file_registry import TemplateFileRegistry
+from boilergen.builder.parser.configs import extract_configs
+from boilergen.builder.parser.injections import Injection, InjectionMethod, InjectionRegistry, run_injections
+from boilergen.builder.parser.tags import TemplateFile, pair_tags
+from boilergen.builder.parser.tokenizer import tokenize
+from boilergen.builder.project_setup import refresh_tags_and_configs_after_injections
+from boilergen.builder.source_cache import SourceCache
+from boilergen.cli.run_config import RunConfig
+
+BASE_CONTENT = (
+    "# <<boilergen:imports\n"
+    "import os\n"
+    "# boilergen:imports>>\n"
+    "\n"
+    "# <<boilergen:routes\n"
+    "# boilergen:routes>>\n"
+    "port = 'boilergen:config | port | 5000'\n"
+)
+
+
+def make_template_file(content: str, destination: str) -> TemplateFile:
+    tokens = tokenize(content)
+    return TemplateFile(content, pair_tags(tokens)[0], extract_configs(content, tokens=tokens), destination,
+                        tokens=tokens)
+
+
+def make_injection(tmp_path, source: str, **kwargs) -> Injection:
+    source_file = tmp_path / f"source_{len(os.listdir(tmp_path))}.txt"
+    source_file.write_text(source, encoding="utf-8")
+    return Injection("base", "app.py", source_file.name, str(tmp_path), **kwargs)
+
+
+@pytest.fixture
+def output_path(tmp_path):
+    return str(tmp_path / "out")
+
+
+def test_injection_into_tag(tmp_path, output_path):
+    tf = make_template_file(BASE_CONTENT, os.path.join(output_path, "app.py"))
+    tf.injections.append(make_injection(tmp_path, "import sys", target_tag="imports", method=InjectionMethod.END))
+
+    run_injections([tf], RunConfig(), output_path)
+
+    assert tf.content.splitlines()[:4] == ["# <<boilergen:imports", "import os", "import sys", "# boilergen:imports>>"]
+
+
+def test_refresh_reindexes_only_edited_files(tmp_path, output_path):
+    target = make_template_file(BASE_CONTENT, os.path.join(output_path, "app.py"))
+    untouched = make_template_file(BASE_CONTENT, os.path.join(output_path, "other.py"))
+    untouched_tokens = untouched.tokens
+    target.injections.extend([
+        make_injection(tmp_path, "from flask import Flask", target_tag="imports", method=InjectionMethod.START),
+        make_injection(tmp_path, "# <<boilergen:extra\nhost = 'boilergen:config | host'\n# boilergen:extra>>",
+                       target_tag="routes", method=InjectionMethod.AFTER),
+    ])
+
+    run_injections([target, untouched], RunConfig(), output_path)
+    refresh_tags_and_configs_after_injections([target, untouched], RunConfig())
+
+    assert untouched.tokens is untouched_tokens
+    full = tokenize(target.content)
+    assert [(t.token_type, t.identifier, t.line, t.start, t.end) for t in target.tokens] == \
+           [(t.token_type, t.identifier, t.line, t.start, t.end) for t in full]
+    assert [(t.tag_identifier, t.line_start, t.line_end) for t in target.tags] == [
+        ("imports", 1, 4), ("routes", 6, 7), ("extra", 8, 10)
+    ]
+    assert [c.identifier for c in target.configs] == ["host", "port"]
+
+
+def test_registry_resolves_normalized_destinations():
+    first = make_template_file("a", os.path.join("out", "api", "app.py"))
+    duplicate = make_template_file("b", os.path.join("out", "api", "app.py"))
+    registry = TemplateFileRegistry([first, duplicate])
+
+    assert registry.resolve("out", os.path.join("api", ".", "app.py")) is first
+    assert registry.get(os.path.join("out", "missing.py")) is None
+    assert list(registry) == [first, duplicate]
+
+    registry.remove(first)
+    assert registry.resolve("out", os.path.join("api", "app.py")) is duplicate
+    other = make_template_file("c", os.path.join("out", "other.py"))
+    registry.append(other)
+    assert registry.remove_destination(os.path.join("out", "api", ".", "app.py")) == [duplicate]
+    assert registry.get(os.path.join("out", "api", "app.py")) is None
+    assert list(registry) == [other]
+
+
+def test_injection_registry_parses_definitions_once():
+    yaml_data = {"injections": [
+        {"target": "base", "at": {"file": "api/app.py", "tag": "imports"}, "from": "a.txt"},
+        {"target": "base", "at": {"file": "./api/app.py", "line": 3}, "method": "above", "from": "b.txt"},
+        {"target": "base", "at": {"file": "main.py", "tag": "routes"}, "method": "replace", "from": "c.txt"},
+    ]}
+    registry = InjectionRegistry()
+    registry.load(yaml_data, os.path.join("t", "injections;", "injections.yaml"))
+    registry.load(yaml_data, os.path.join("t", "injections;", "injections.yaml"))
+
+    assert len(registry) == 3
+    assert [i.source_file for i in registry.targets("api/app.py")] == ["a.txt", "b.txt"]
+    assert registry.targets("main.py")[0].method == InjectionMethod.REPLACE
+
+
+def test_source_cache_reads_once_and_revalidates(tmp_path):
+    source = tmp_path / "snippet.txt"
+    source.write_text("a\nb\n", encoding="utf-8")
+    cache = SourceCache()
+
+    assert cache.get_lines(str(source)) == ("a", "b")
+    assert cache.get_lines(str(tmp_path / "." / "snippet.txt")) == ("a", "b")
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    source.write_text("changed\n", encoding="utf-8")
+    os.utime(source, ns=(source.stat().st_atime_ns, source.stat().st_mtime_ns + 1_000_000_000))
+
+    assert cache.get_lines(str(source)) == ("changed",)
+    assert cache.misses == 2
+
+
+def test_injection_plan_uses_original_positions(tmp_path, output_path):
+    tf = make_template_file("l1\nl2\nl3\nl4", os.path.join(output_path, "app.py"))
+    tf.injections.extend([
+        make_injection(tmp_path, "after 3", line=3, method=InjectionMethod.AFTER),
+        make_injection(tmp_path, "before 2\nbefore 2b", line=2, method=InjectionMethod.BEFORE),
+        make_injection(tmp_path, "replaced 4", line=4, method=InjectionMethod.REPLACE),
+    ])
+
+    plans = run_injections([tf], RunConfig(), output_path)
+
+    assert tf.content.splitlines() == ["l1", "before 2", "before 2b", "l2", "l3", "after 3", "replaced 4"]
+    assert len(plans) == 1 and len(plans[0].steps) == 3
+
+
+def test_injection_plan_orders_shared_positions_and_skips_conflicts(tmp_path, output_path):
+    tf = make_template_file("# <<boilergen:a\n# boilergen:a>>\nrest", os.path.join(output_path, "app.py"))
+    tf.injections.extend([
+        make_injection(tmp_path, "bottom", target_tag="a", method=InjectionMethod.END),
+        make_injection(tmp_path, "top", target_tag="a", method=InjectionMethod.START),
+        make_injection(tmp_path, "new rest", line=3, method=InjectionMethod.REPLACE),
+        make_injection(tmp_path, "lost", line=3, method=InjectionMethod.REPLACE),
+        make_injection(tmp_path, "nowhere", target_tag="missing", method=InjectionMethod.END),
+    ])
+
+    plan = run_injections([tf], RunConfig(), output_path)[0]
+
+    assert tf.content.splitlines() == ["# <<boilergen:a", "top", "bottom", "# boilergen:a>>", "new rest"]
+    assert [step.injection.source_file for step in plan.skipped] == ["source_3.txt"]
+    assert "tag 'missing' not found" in plan.explain()
+
+
+@pytest.mark.parametrize("method, kwargs, expected", [
+    (InjectionMethod.BEFORE, {"target_tag": "t"}, "a0|one|two|three|# <<boilergen:t|x|# boilergen:t>>|z"),
+    (InjectionMethod.AFTER, {"target_tag": "t"}, "a0|# <<boilergen:t|x|# boilergen:t>>|three|two|one|z"),
+    (InjectionMethod.START, {"target_tag": "t"}, "a0|# <<boilergen:t|three|two|one|x|# boilergen:t>>|z"),
+    (InjectionMethod.END, {"target_tag": "t"}, "a0|# <<boilergen:t|x|one|two|three|# boilergen:t>>|z"),
+    (InjectionMethod.BEFORE, {"line": 3}, "a0|# <<boilergen:t|three|two|one|x|# boilergen:t>>|z"),
+    (InjectionMethod.AFTER, {"line": 3}, "a0|# <<boilergen:t|x|three|two|one|# boilergen:t>>|z"),
+])
+def test_multiple_injections_at_one_position_keep_stacking_order(tmp_path, output_path, method, kwargs, expected):
+    content = "a0\n# <<boilergen:t\nx\n# boilergen:t>>\nz\n"
+    tf = make_template_file(content, os.path.join(output_path, "app.py"))
+    for source in ("one", "two", "three"):
+        tf.injections.append(make_injection(tmp_path, source, method=method, **kwargs))
+
+    run_injections([tf], RunConfig(), output_path)
+
+    assert tf.content.replace("\n", "|") == expected
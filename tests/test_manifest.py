@@ -0,0 +1,64 @@
+import pytest
+from boilergen.builder.output_selection import generate_project, prepare_output_directory
+from boilergen.cli.manifest import Manifest, ManifestError
+from boilergen.cli.run_config import RunConfig
+from boilergen.core.catalog import TemplateCatalog
+from boilergen.core.ui import get_ui
+
+
+def test_manifest_validation(tmp_path):
+    manifest = Manifest.from_dict({"templates": "api", "output": "out", "config": {"port": 1}}, tmp_path)
+    assert manifest.templates == ["api"]
+    assert manifest.output == tmp_path / "out"
+    assert manifest.config == {"port": 1}
+
+    for data in ([], {"output": "out"}, {"templates": ["api"]}, {"templates": ["api"], "output": "out", "config": 1}):
+        with pytest.raises(ManifestError):
+            Manifest.from_dict(data, tmp_path)
+
+    (tmp_path / "broken.yaml").write_text("templates: [api\n")
+    with pytest.raises(ManifestError, match="Cannot read manifest"):
+        Manifest.from_file(tmp_path / "broken.yaml")
+
+
+def test_manifest_generates_project_without_prompts(tmp_path, templates_dir):
+    (tmp_path / "spec.yaml").write_text("templates: [api]\noutput: out\nconfig:\n  port: 8080\n")
+
+    manifest = Manifest.from_file(tmp_path / "spec.yaml")
+    catalog = TemplateCatalog(str(templates_dir))
+    selected = manifest.select_templates(catalog.templates)
+    assert sorted(t.id for t in selected) == ["api", "base"]
+
+    with pytest.raises(ManifestError, match="missing"):
+        Manifest(["missing"], manifest.output).select_templates(catalog.templates)
+
+    run_config = RunConfig(minimal_ui=True, headless=True, config_values=manifest.config, jobs=1)
+    ui = get_ui(True)
+    assert prepare_output_directory(manifest.output, run_config, ui, confirm=False)
+    generate_project(manifest.output, selected, run_config, str(templates_dir))
+
+    assert (tmp_path / "out" / "api.py").read_text().strip() == "port = 8080"
+    assert (tmp_path / "out" / "base.py").read_text() == "base\n"
+    # Regenerating into the same directory needs clear_output, which the manifest confirms on its own
+    assert not prepare_output_directory(manifest.output, run_config, ui, confirm=False)
+    run_config.clear_output = True
+    assert prepare_output_directory(manifest.output, run_config, ui, confirm=False)
+    assert not (tmp_path / "out" / "api.py").exists()
+
+
+def test_create_manifest_reports_missing_config_values(tmp_path, monkeypatch, make_template):
+    from typer.testing import CliRunner
+    from boilergen.cli import commands
+
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "config"))
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setattr(commands, "DEFAULT_TEMPLATE_DIR", tmp_path / "boilergen")
+    make_template(tmp_path / "boilergen" / "templates", "app", files={"app.env": "SECRET=boilergen:config | secret\n"})
+    (tmp_path / "spec.yaml").write_text("templates: [app]\noutput: out\n")
+
+    result = CliRunner().invoke(commands.app, ["create", "--minimal-ui", "--manifest", str(tmp_path / "spec.yaml")])
+
+    assert result.exit_code == 1
+    assert result.exception is None or isinstance(result.exception, SystemExit)
+    assert "Missing config value for 'secret'" in result.output
+    assert not (tmp_path / "out").exists()
@@ -0,0 +1,153 @@
+import pytest
+from boilergen.builder.parse_cache import ParseCache, parse_content
+from boilergen.builder.parser.configs import extract_configs, NOT_DEFINED
+from boilergen.builder.parser.interval_tree import IntervalTree
+from boilergen.builder.parser.line_map import LineShiftMap
+from boilergen.builder.parser.tags import TemplateFile, extract_tags, pair_tags, TagDiagnostic
+from boilergen.builder.parser.tokenizer import tokenize, TokenType
+
+SAMPLE = (
+    "# <<boilergen:imports\n"
+    "from flask import Flask\n"
+    "# boilergen:imports>>\n"
+    "host = 'boilergen:config | IP | \"0.0.0.0\"'\n"
+    "port = boilergen:config | port\n"
+)
+
+
+def test_tokenize_emits_tags_and_configs_in_one_pass():
+    tokens = tokenize(SAMPLE)
+
+    assert [(t.token_type, t.identifier, t.line) for t in tokens] == [
+        (TokenType.TAG_OPEN, "imports", 1),
+        (TokenType.TAG_CLOSE, "imports", 3),
+        (TokenType.CONFIG, "IP", 4),
+        (TokenType.CONFIG, "port", 5),
+    ]
+
+
+def test_tokenize_offsets_point_into_content():
+    tokens = tokenize(SAMPLE)
+    ip = tokens[2]
+
+    assert SAMPLE[ip.start:ip.end] == 'boilergen:config | IP | "0.0.0.0"'
+    assert ip.quote == "'"
+
+
+def test_tokenize_without_markers():
+    assert tokenize("plain text\nwithout anything\n") == []
+
+
+def test_extract_tags_and_configs_share_tokens():
+    tokens = tokenize(SAMPLE)
+    tags = extract_tags(SAMPLE, tokens=tokens)
+    configs = extract_configs(SAMPLE, tokens=tokens)
+
+    assert [(t.tag_identifier, t.line_start, t.line_end) for t in tags] == [("imports", 1, 3)]
+    assert [c.identifier for c in configs] == ["IP", "port"]
+    assert configs[0].in_template_value == '"0.0.0.0"'
+    assert configs[1].in_template_value is NOT_DEFINED
+
+
+def test_pair_tags_nested_same_identifier():
+    content = "<<boilergen:a\n<<boilergen:a\nboilergen:a>>\nboilergen:a>>\n"
+    tags, diagnostics = pair_tags(tokenize(content))
+
+    assert [(t.line_start, t.line_end) for t in tags] == [(1, 4), (2, 3)]
+    assert diagnostics == []
+
+
+def test_pair_tags_reports_unbalanced_tags():
+    content = "boilergen:x>>\n<<boilergen:a\n<<boilergen:b\nboilergen:b>>\n"
+    tags, diagnostics = pair_tags(tokenize(content))
+
+    assert [(t.tag_identifier, t.line_start, t.line_end) for t in tags] == [("b", 3, 4)]
+    assert [(d.kind, d.tag_identifier, d.line) for d in diagnostics] == [
+        (TagDiagnostic.UNOPENED, "x", 1),
+        (TagDiagnostic.UNCLOSED, "a", 2),
+    ]
+
+
+def test_line_shift_map_translates_original_lines():
+    line_map = LineShiftMap()
+    line_map.record(4, 2, 1)  # lines 5-6 replaced by one line
+    line_map.record(1, 0, 3)  # three lines inserted before line 2
+
+    assert [line_map.map_line(n) for n in range(1, 9)] == [1, 5, 6, 7, None, None, 9, 10]
+    assert line_map.inserted_lines() == [2, 3, 4, 8]
+
+
+def test_tags_follow_recorded_line_edits():
+    content = "<<boilergen:a\nboilergen:a>>\n<<boilergen:b\nboilergen:b>>\n"
+    tokens = tokenize(content)
+    tf = TemplateFile(content, pair_tags(tokens)[0], [], "dest", tokens=tokens)
+
+    tf.record_line_edit(2, 0, 2)
+
+    assert [(t.tag_identifier, t.line_start, t.line_end) for t in tf.tags] == [("a", 1, 2), ("b", 5, 6)]
+    assert tf.tags[1].origin_start == 3
+
+
+def test_interval_tree_returns_enclosing_intervals_outermost_first():
+    tree = IntervalTree([(1, 10, "outer"), (2, 5, "inner"), (6, 9, "sibling"), (12, 14, "after")])
+
+    assert tree.query(3) == ["outer", "inner"]
+    assert tree.query(9) == ["outer", "sibling"]
+    assert tree.query(11) == []
+    assert IntervalTree([]).query(1) == []
+
+
+def test_template_file_tag_lookups_follow_changes():
+    content = "<<boilergen:outer\n<<boilergen:inner\nx\nboilergen:inner>>\nboilergen:outer>>\n"
+    tokens = tokenize(content)
+    tf = TemplateFile(content, pair_tags(tokens)[0], [], "dest", tokens=tokens)
+
+    assert tf.find_tag("inner").line_start == 2
+    assert [t.tag_identifier for t in tf.enclosing_tags(3)] == ["outer", "inner"]
+
+    tf.record_line_edit(0, 0, 3)
+    assert tf.find_tag("inner").line_start == 5
+    assert [t.tag_identifier for t in tf.enclosing_tags(3)] == []
+
+    tf.record_line_edit(1, 1, 1)  # replaces the line holding the opening marker of inner
+    assert tf.find_tag("inner") is None
+    assert tf.find_tag("missing") is None
+
+
+def test_parse_cache_round_trips_through_disk(tmp_path):
+    content = 'a = "boilergen:config | host | \'0.0.0.0\'"\n<<boilergen:a\nx\nboilergen:a>>\nboilergen:b>>\n'
+    path = ParseCache.path_for(tmp_path)
+    cache = ParseCache.load(path)
+    tokens, tags, diagnostics = parse_content(content, cache)
+    cache.save()
+
+    warm = ParseCache.load(path)
+    cached_tokens, cached_tags, cached_diagnostics = parse_content(content, warm)
+
+    assert (warm.hits, warm.misses) == (1, 0)
+    assert repr(cached_tokens) == repr(tokens)
+    assert [(t.value, t.quote) for t in cached_tokens] == [(t.value, t.quote) for t in tokens]
+    assert [(t.tag_identifier, t.line_start, t.line_end) for t in cached_tags] == [("a", 2, 4)]
+    assert repr(cached_diagnostics) == repr(diagnostics)
+    assert cached_tags[0] is not tags[0]
+
+    # A run that only hits the cache does not rewrite it
+    written = path.stat().st_mtime_ns
+    assert not warm.dirty
+    warm.save()
+    assert path.stat().st_mtime_ns == written
+
+
+def test_parse_cache_evicts_least_recently_used(tmp_path):
+    cache = ParseCache(ParseCache.path_for(tmp_path))
+    contents = [f"<<boilergen:t{i}\nboilergen:t{i}>>\n" for i in range(3)]
+    for content in contents:
+        parse_content(content, cache)
+    cache.max_bytes = cache.size - 1
+    cache.get(contents[0])
+    cache.save()
+
+    reloaded = ParseCache.load(cache.path)
+    assert len(reloaded) == 2
+    assert reloaded.get(contents[1]) is None
+    assert reloaded.get(contents[0]) is not None
@@ -1,5 +1,7 @@
 import pytest
-from boilergen.builder.project_setup import sort_templates_by_dependencies
+from pathlib import Path
+from boilergen.builder.project_setup import sort_templates_by_dependencies, prepare_objects, read_template_file
+from boilergen.cli.run_config import RunConfig
 from boilergen.core.template import Template
 
 def test_sort_templates_linear():
@@ -42,3 +44,102 @@ def test_sort_templates_missing_non_strict():
     
     sorted_ts = sort_templates_by_dependencies([t1], strict=False)
     assert [t.id for t in sorted_ts] == ["t1"]
+
+def test_prepare_objects_reuses_parsed_manifest(tmp_path):
+    template_dir = tmp_path / "web"
+    (template_dir / "template").mkdir(parents=True)
+    (template_dir / "template.yaml").write_text("id: web\nlabel: Web\nconfig:\n  port: 8080\n")
+    (template_dir / "template" / "app.py").write_text("port = boilergen:config | port | 80\n")
+    template = Template.from_yaml_file(str(template_dir))
+
+    # Discovery already parsed the manifest, later edits in the same run are not picked up
+    (template_dir / "template.yaml").write_text("id: web\nlabel: Web\nconfig:\n  port: 9090\n")
+    template_files = prepare_objects(tmp_path / "out", [template], RunConfig())
+
+    assert template.config == {"port": 8080}
+    assert template_files[0].configs[0].insertion_value == 8080
+
+def test_prepare_objects_parallel_reads_keep_order(tmp_path, make_template):
+    templates = []
+    for name, requires in (("base", []), ("api", ["base"])):
+        files = {f"pkg/{name}_{i}.py": f"<<boilergen:body\n# {name} {i}\nboilergen:body>>\n" for i in range(5)}
+        templates.append(Template.from_yaml_file(str(make_template(tmp_path, name, requires, files))))
+
+    serial = prepare_objects(tmp_path / "out", list(reversed(templates)), RunConfig(jobs=1))
+    parallel = prepare_objects(tmp_path / "out", list(reversed(templates)), RunConfig(jobs=4))
+
+    assert [(tf.destination_path, tf.content) for tf in parallel] == [(tf.destination_path, tf.content) for tf in serial]
+    # Dependency order is kept, every base file comes before the api files
+    assert [tf.content.splitlines()[1].split()[1] for tf in parallel] == ["base"] * 5 + ["api"] * 5
+    assert all(f"# {Path(tf.destination_path).stem.replace('_', ' ')}\n" in tf.content for tf in parallel)
+
+def test_prepare_objects_streams_files_outside_of_injections(tmp_path, make_template):
+    base_dir = make_template(tmp_path, "base", files={
+        "main.py": "<<boilergen:imports\nboilergen:imports>>\n",
+        "README.md": "# boilergen:config | name | demo\n",
+    })
+    ext_dir = make_template(tmp_path, "ext", ["base"], files={"ext.py": "ext\n"}, injections={
+        "injections.yaml": "injections:\n  - target: base\n    at:\n      file: main.py\n      tag: imports\n"
+                           "    from: imp.py\n    method: below\n",
+    })
+
+    streamed = []
+    templates = [Template.from_yaml_file(str(ext_dir)), Template.from_yaml_file(str(base_dir))]
+    template_files = prepare_objects(tmp_path / "out", templates, RunConfig(), stream=streamed.append)
+
+    assert [Path(tf.destination_path).name for tf in template_files] == ["main.py"]
+    assert [Path(tf.destination_path).name for tf in streamed] == ["README.md"]
+    assert [Path(dest).name for _, dest in template_files.passthrough.values()] == ["ext.py"]
+    assert len(template_files.injections) == 1
+
+
+def test_prepare_objects_passes_assets_through(tmp_path, make_template):
+    template_dir = make_template(tmp_path, "web", files={
+        "logo.png": b"\x89PNG\r\n\x1a\n\xff\xfe boilergen:x",
+        "notes.txt": "no markers here\n",
+        "app.py": "port = boilergen:config | port | 80\n",
+    })
+
+    template_files = prepare_objects(tmp_path / "out", [Template.from_yaml_file(str(template_dir))], RunConfig())
+
+    assert [Path(tf.destination_path).name for tf in template_files] == ["app.py"]
+    assert sorted(Path(src).name for src, _ in template_files.passthrough.values()) == ["logo.png", "notes.txt"]
+
+def test_read_template_file_finds_markers_across_chunks(tmp_path):
+    path = tmp_path / "big.txt"
+    path.write_bytes(b"x" * ((1 << 16) - 4) + b"boilergen:config | a | 1\r\n")
+
+    assert read_template_file(path).endswith("boilergen:config | a | 1\n")
+    assert read_template_file(tmp_path / "big.txt", text_required=True) == read_template_file(path)
+
+
+def test_read_template_file_keeps_text_before_a_late_marker(tmp_path, monkeypatch):
+    monkeypatch.setattr("boilergen.builder.project_setup._READ_CHUNK_SIZE", 8)
+    plain, late, broken = tmp_path / "plain.txt", tmp_path / "late.txt", tmp_path / "broken.txt"
+    plain.write_text("no markers in here at all\n" * 4)
+    late.write_text("first line\nsecond line\nvalue = boilergen:config | a | 1\n")
+    broken.write_bytes(b"value = boilergen:config | a | 1\n" + b"\xff" * 16)
+
+    assert read_template_file(plain) is None
+    assert read_template_file(late) == late.read_text()
+    assert read_template_file(broken) is None
+
+def test_create_project_stream_writes_land_before_passthrough_copies(tmp_path, monkeypatch, make_template):
+    import time
+    from boilergen.builder import project_setup, writer
+
+    make_template(tmp_path, "base", files={"README.md": "boilergen:config | name | demo\n"})
+    make_template(tmp_path, "ext", ["base"], files={"README.md": "ext\n"})
+    templates = [Template.from_yaml_file(str(tmp_path / name)) for name in ("base", "ext")]
+
+    original_write = writer._write
+    def delayed(item):
+        time.sleep(0.2)
+        return original_write(item)
+    monkeypatch.setattr(writer, "_write", delayed)
+
+    run_config = RunConfig(minimal_ui=True, headless=True, stream=True, jobs=2)
+    project_setup.create_project(str(tmp_path / "out"), templates, run_config)
+
+    # ext is generated after base, its unchanged README has to win over the streamed one
+    assert (tmp_path / "out" / "README.md").read_text() == "ext\n"
@@ -0,0 +1,15 @@
+import subprocess
+import sys
+
+HEAVY_MODULES = ["questionary", "prompt_toolkit", "git", "yaml", "tqdm", "rainbow_tqdm"]
+
+
+def test_cli_import_defers_heavy_dependencies():
+    # A fresh interpreter, modules imported by other tests would hide regressions
+    code = (
+        "import sys, boilergen.cli.commands; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == ""
@@ -1,6 +1,7 @@
 import pytest
 from pathlib import Path
 import yaml
+from boilergen.core.catalog import TemplateCatalog
 from boilergen.core.template_finder import (
     list_subgroups_and_templates,
     find_all_templates,
@@ -87,3 +88,61 @@ def test_resolve_dependencies_already_selected(mock_template_structure):
     
     assert set(required) == {"t1", "t2", "t3"}
     assert set(auto) == {"t1"}
+
+def test_catalog_lists_directories_without_touching_disk(mock_template_structure):
+    catalog = TemplateCatalog(mock_template_structure)
+    (mock_template_structure / "group1" / "t2" / "template.yaml").unlink()
+
+    subgroups, templates = catalog.list(mock_template_structure / "group1")
+    assert subgroups == []
+    assert [t.id for t in templates] == ["t2"]
+    assert catalog.list(str(mock_template_structure / "group2")) == (["subgroup1"], [])
+    assert catalog.list(mock_template_structure / "missing") == ([], [])
+    assert set(catalog.templates) == {"t1", "t2", "t3"}
+
+def test_cached_catalog_only_reparses_changed_templates(mock_template_structure, tmp_path_factory):
+    cache_dir = tmp_path_factory.mktemp("cache")
+    first = TemplateCatalog.cached(mock_template_structure, cache_dir)
+    assert first.index.reparsed == 3
+
+    warm = TemplateCatalog.cached(mock_template_structure, cache_dir)
+    assert warm.index.reparsed == 0
+    assert {tid: t.requires for tid, t in warm.templates.items()} == {"t1": [], "t2": ["t1"], "t3": ["t2"]}
+    assert [t.id for t in warm.list(mock_template_structure)[1]] == ["t1"]
+
+    (mock_template_structure / "group1" / "t2" / "template.yaml").write_text(yaml.dump({
+        "id": "t2",
+        "label": "Template 2 renamed",
+        "requires": []
+    }))
+    t4_dir = mock_template_structure / "t4"
+    t4_dir.mkdir()
+    (t4_dir / "template.yaml").write_text(yaml.dump({"id": "t4", "label": "Template 4"}))
+
+    changed = TemplateCatalog.cached(mock_template_structure, cache_dir)
+    assert changed.index.reparsed == 2
+    assert changed.templates["t2"].label == "Template 2 renamed"
+    assert "t4" in changed.templates
+
+def test_cached_catalog_tolerates_unstorable_configs_and_corrupt_index(mock_template_structure, tmp_path_factory):
+    cache_dir = tmp_path_factory.mktemp("cache")
+    (mock_template_structure / "t1" / "template.yaml").write_text("id: t1\nlabel: T1\nconfig:\n  released: 2024-01-01\n")
+
+    TemplateCatalog.cached(mock_template_structure, cache_dir)
+    warm = TemplateCatalog.cached(mock_template_structure, cache_dir)
+    # Dates cannot be stored in the index, only that template is parsed again
+    assert warm.index.reparsed == 1
+    assert str(warm.templates["t1"].config["released"]) == "2024-01-01"
+
+    warm.index.path.write_bytes(b"not an index")
+    assert TemplateCatalog.cached(mock_template_structure, cache_dir).index.reparsed == 3
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_catalog_discovery_matches_serial_listing(mock_template_structure, jobs):
+    catalog = TemplateCatalog(mock_template_structure, jobs=jobs)
+
+    for path in (mock_template_structure, mock_template_structure / "group2" / "subgroup1"):
+        subgroups, templates = list_subgroups_and_templates(str(path))
+        listed_subgroups, listed_templates = catalog.list(path)
+        assert listed_subgroups == subgroups
+        assert [(t.id, t.path) for t in listed_templates] == [(t.id, t.path) for t in templates]
@@ -0,0 +1,57 @@
+import pytest
+from boilergen.builder.writer import LinkMode, StreamWriter, copy_files, write_files, format_bytes
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_write_files_creates_parents_and_reports_throughput(tmp_path, jobs):
+    files = [(str(tmp_path / "a" / "b" / f"f{i}.txt"), f"line {i}\nä\n") for i in range(10)]
+    files.append((str(tmp_path / "top.txt"), "top"))
+
+    stats = write_files(files, jobs)
+
+    assert stats.files == 11
+    assert stats.bytes_written == sum(len(content.encode("utf-8")) for _, content in files)
+    assert (tmp_path / "a" / "b" / "f3.txt").read_text(encoding="utf-8") == "line 3\nä\n"
+    assert stats.files_per_second > 0
+    assert "files/s" in str(stats)
+
+
+def test_write_files_last_duplicate_wins(tmp_path):
+    target = tmp_path / "out" / "same.txt"
+    stats = write_files([(str(target), "first"), (str(tmp_path / "out" / "." / "same.txt"), "second")], jobs=4)
+
+    assert stats.files == 1
+    assert target.read_text() == "second"
+
+
+def test_format_bytes():
+    assert format_bytes(512) == "512 B"
+    assert format_bytes(2048) == "2.0 KiB"
+    assert format_bytes(3 * 1024 ** 3) == "3.0 GiB"
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_stream_writer_writes_as_it_goes(tmp_path, jobs):
+    writer = StreamWriter(jobs)
+    for i in range(20):
+        writer.write(str(tmp_path / "pkg" / f"m{i % 5}.py"), f"value = {i}\n")
+    stats = writer.close()
+
+    assert stats.files == 20
+    assert stats.bytes_written == sum(len(f"value = {i}\n") for i in range(20))
+    # Rewrites of the same path keep their order
+    assert (tmp_path / "pkg" / "m4.py").read_text() == "value = 19\n"
+
+
+@pytest.mark.parametrize("link_mode", list(LinkMode))
+def test_copy_files_keeps_bytes(tmp_path, link_mode):
+    source = tmp_path / "logo.png"
+    source.write_bytes(b"\x89PNG\r\n\x1a\n\x00\xff")
+    destination = tmp_path / "out" / "assets" / "logo.png"
+    destination.parent.mkdir(parents=True)
+    destination.write_bytes(b"stale")
+
+    stats = copy_files([(str(source), str(destination))], link_mode)
+
+    assert destination.read_bytes() == source.read_bytes()
+    assert stats.bytes_written == 10